@@ -8,73 +8,133 @@ CSV Format Expected: timestamp_us,message_type,direction,origin,destination,unit
 """
 
 import os
-import csv
 import glob
-import statistics
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+# Columns read from component message logs; the rest are never parsed
+RECEIVE_COLUMNS = ('direction', 'origin', 'destination', 'latency_us')
+RECEIVE_DTYPES = {'direction': 'category', 'origin': 'category', 'destination': 'category', 'latency_us': str}
+
 def find_csv_files(log_directory, id=""):
-    """Find all CSV files in the specified directory."""
+    """Yield all CSV files in the specified directory, as they are found."""
     log_path = Path(log_directory)
     
     # looks for component message CSV files
-    csv_files = list(log_path.glob(f"*gateway_" + id + "_messages.csv"))
+    found = False
+    for csv_file in log_path.glob(f"*gateway_" + id + "_messages.csv"):
+        found = True
+        yield csv_file
     
     # if no specific message files, look for any CSV files
-    if not csv_files:
-        csv_files = list(log_path.glob("*.csv"))
-    
-    return csv_files
+    if not found:
+        yield from log_path.glob("*.csv")
+
+def category_lookup(column, func, dtype):
+    """Evaluate func once per category of a categorical column; return the per-row results."""
+    per_category = np.array([func(c) for c in column.cat.categories], dtype=dtype)
+    return per_category[column.cat.codes.to_numpy()]
+
+def read_receive_latencies(csv_file):
+    """Parse the latency values of RECEIVE messages in a CSV file, as a float64 array."""
+    try:
+        header = pd.read_csv(csv_file, nrows=0).columns
+
+        # latency-only logs: every positive value counts. The C parser reads
+        # the column straight into int64 (surrounding spaces included) and
+        # the filter is one vectorized mask
+        if len(header) and header[0] == 'latency_us':
+            latencies = pd.read_csv(csv_file, usecols=['latency_us'], dtype={'latency_us': np.int64},
+                                    engine='c')['latency_us'].to_numpy()
+            return latencies[latencies > 0].astype(np.float64)
+
+        # Parsed column-wise by the C parser; the filters below run over whole columns.
+        # direction/origin/destination hold a handful of distinct values, so they are
+        # stored as categoricals: one small code per row instead of a string object,
+        # and the string operations run once per distinct value
+        df = pd.read_csv(csv_file, usecols=[c for c in header if c in RECEIVE_COLUMNS],
+                         dtype=RECEIVE_DTYPES, keep_default_na=False, engine='c')
+        if 'direction' not in df:
+            return np.empty(0)
+        missing = pd.Series('', index=df.index, dtype='category')
+        origin = df['origin'] if 'origin' in df else missing
+        destination = df['destination'] if 'destination' in df else missing
+        if 'latency_us' not in df:
+            return np.empty(0)  # no latency, so nothing passes the > 0 test
+
+        # RECEIVE messages between different components; rows are matched to
+        # the per-category results by their codes
+        is_receive = category_lookup(df['direction'], lambda d: d.strip().upper() == 'RECEIVE', bool)
+        component_ids = {}  # origin/destination without the unit suffix -> shared id
+        component_id = lambda c: component_ids.setdefault(c.strip()[:-1], len(component_ids))
+        selected = is_receive & (category_lookup(origin, component_id, np.int64)
+                                 != category_lookup(destination, component_id, np.int64))
+
+        # only the selected rows have their latency text converted; invalid
+        # values become NaN and fail the > 0 test
+        latency_us = pd.to_numeric(df['latency_us'][selected].str.strip(), errors='coerce').to_numpy(dtype=np.float64)
+        return latency_us[latency_us > 0]
+
+    except pd.errors.EmptyDataError:
+        return np.empty(0)  # empty log, nothing to report
 
 def extract_receive_latencies(csv_file):
-    """Extract latency values from RECEIVE messages in a CSV file."""
-    latencies = []
-    
+    """Extract latency values from RECEIVE messages in a CSV file, as a float64 array.
+
+    The result is cached next to the log as <name>.latencies.npy and reused
+    while the cache is newer than the log, so rerunning the analysis after
+    adding logs only parses the new ones.
+    """
+    csv_file = Path(csv_file)
+    cache_path = csv_file.with_suffix('.latencies.npy')
+    try:
+        if cache_path.stat().st_mtime > csv_file.stat().st_mtime:
+            return np.load(cache_path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass  # No cache yet (or an unreadable one): parse the CSV
+
     try:
-        with open(csv_file, 'r', newline='') as file:
-            reader = csv.DictReader(file)
-
-            file_type = reader.fieldnames and reader.fieldnames[0] == 'latency_us'
-            
-            for row in reader:
-                # filters for RECEIVE messages only
-                
-                if not file_type and row.get('direction', '').strip().upper() == 'RECEIVE':
-                    try:
-                        latency_us = float(row.get('latency_us', 0))
-                        if row.get('origin', '').strip()[:-1] != row.get('destination', '').strip()[:-1] and latency_us > 0:  # only positive latencies are valid
-                            latencies.append(latency_us)
-                    except (ValueError, TypeError):
-                        continue  # skip invalid values
-                if file_type and int(row.get('latency_us', '').strip()) > 0:
-                    latencies.append(int(row.get('latency_us', '').strip()))
-                        
+        latencies = read_receive_latencies(csv_file)
     except Exception as e:
+        # not cached, so the error is reported again on the next run
         print(f"Error reading {csv_file}: {e}")
-    
+        return np.empty(0)
+    try:
+        np.save(cache_path, latencies)
+    except OSError as e:
+        print(f"Could not write latency cache '{cache_path}': {e}", file=sys.stderr)
     return latencies
 
-def calculate_outliers(latencies, method='IQR'):
-    """Calculate outliers using IQR (Interquartile Range) method."""
+def calculate_outliers(latencies, method='IQR', presorted=False):
+    """Calculate outliers using IQR (Interquartile Range) method.
+    
+    Accepts a list or array; the outliers are returned as an array, in input order.
+    Pass presorted=True with an already sorted array to skip finding the quartiles again.
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
     if len(latencies) < 4:
-        return [], 0, 0
+        return np.empty(0), 0, 0
     
-    sorted_latencies = sorted(latencies)
-    n = len(sorted_latencies)
+    n = len(latencies)
     
-    # Calculate Q1 (25th percentile) and Q3 (75th percentile)
+    # Calculate Q1 (25th percentile) and Q3 (75th percentile) at the same
+    # ranks as indexing the sorted data; unsorted input needs one partial partition
     q1_index = int(n * 0.25)
     q3_index = int(n * 0.75)
-    q1 = sorted_latencies[q1_index]
-    q3 = sorted_latencies[q3_index]
+    ranked = latencies if presorted else np.partition(latencies, [q1_index, q3_index])
+    q1 = ranked[q1_index]
+    q3 = ranked[q3_index]
     
     # Calculate IQR and bounds
     iqr = q3 - q1
     lower_bound = q1 - 1.5 * iqr
     upper_bound = q3 + 1.5 * iqr
     
-    outliers = [lat for lat in latencies if lat < lower_bound or lat > upper_bound]
+    outliers = latencies[(latencies < lower_bound) | (latencies > upper_bound)]
     
     return outliers, lower_bound, upper_bound
 
@@ -87,16 +147,28 @@ def analyze_latency_data(csv_files):
     print()
     
     # extracts all latencies from RECEIVE messages
-    all_latencies = []
     file_stats = {}
     
-    for csv_file in csv_files:
-        latencies = extract_receive_latencies(csv_file)
-        all_latencies.extend(latencies)
+    # Each file is parsed in its own process; map() keeps the input order
+    workers = min(os.cpu_count() or 1, len(csv_files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(extract_receive_latencies, csv_files, chunksize=1))
+    else:
+        results = [extract_receive_latencies(csv_file) for csv_file in csv_files]
+    
+    for csv_file, latencies in zip(csv_files, results):
         file_stats[csv_file.name] = len(latencies)
         print(f"{csv_file.name}: {len(latencies)} RECEIVE messages")
     
-    if not all_latencies:
+    # Copied once into a single preallocated array
+    all_latencies = np.empty(sum(len(latencies) for latencies in results))
+    offset = 0
+    for latencies in results:
+        all_latencies[offset:offset + len(latencies)] = latencies
+        offset += len(latencies)
+    
+    if not len(all_latencies):
         print("\nNo RECEIVE messages with valid latencies found!")
         print("This could mean:")
         print("  1. No consumer components were active")
@@ -106,21 +178,26 @@ def analyze_latency_data(csv_files):
     
     # filter out latencies above 200,000 μs (200ms)
     total_messages = len(all_latencies)
-    cleaned_latencies = [lat for lat in all_latencies if lat <= 1000000]
-    filtered_count = total_messages - len(cleaned_latencies)
+    # The filtered array is built once and every statistic below reads it
+    cleaned = all_latencies[all_latencies <= 1000000]
+    filtered_count = total_messages - len(cleaned)
     filtered_percentage = (filtered_count / total_messages) * 100 if total_messages > 0 else 0
     
-    if not cleaned_latencies:
+    if not len(cleaned):
         print("\nNo valid latencies found after filtering!")
         return False
     
-    # calculates statistics for cleaned dataset
-    cleaned_total = len(cleaned_latencies)
-    cleaned_average = statistics.mean(cleaned_latencies)
-    cleaned_std_dev = statistics.stdev(cleaned_latencies) if cleaned_total > 1 else 0
-    cleaned_min = min(cleaned_latencies)
-    cleaned_max = max(cleaned_latencies)
-    cleaned_median = statistics.median(cleaned_latencies)
+    # calculates statistics for cleaned dataset, as NumPy reductions over one array.
+    # It is sorted once; the order statistics below are read from that copy
+    sorted_cleaned = np.sort(cleaned)
+    cleaned_total = len(cleaned)
+    cleaned_average = cleaned.mean()
+    cleaned_std_dev = cleaned.std(ddof=1) if cleaned_total > 1 else 0
+    cleaned_min = sorted_cleaned[0]
+    cleaned_max = sorted_cleaned[-1]
+    middle = cleaned_total // 2
+    cleaned_median = (sorted_cleaned[middle] if cleaned_total % 2
+                      else (sorted_cleaned[middle - 1] + sorted_cleaned[middle]) / 2)
     
     print(f"\n LATENCY ANALYSIS RESULTS")
     print("=" * 60)
@@ -155,19 +232,15 @@ def analyze_latency_data(csv_files):
     # additional percentiles
     print(f"\n LATENCY PERCENTILES")
     print("-" * 40)
-    sorted_percentile_data = sorted(cleaned_latencies)
-    n = len(sorted_percentile_data)
+    n = cleaned_total
     
     percentiles = [50, 75, 90, 95, 99]
     for p in percentiles:
         index = min(int(n * p / 100), n - 1)
-        print(f"P{p:2d} (bottom {p:2d}%):                 {sorted_percentile_data[index]:.2f} μs")
+        print(f"P{p:2d} (bottom {p:2d}%):                 {sorted_cleaned[index]:.2f} μs")
 
-    counter = 0
-    counter_total = len(cleaned_latencies)
-    for latency in sorted_percentile_data:
-        if latency > 10000:
-            counter += 1
+    counter = n - int(np.searchsorted(sorted_cleaned, 10000, side='right'))
+    counter_total = cleaned_total
     print(f"Number of latencies > 10ms: {counter}")
     print(f"Percentage of latencies > 10ms: {counter / counter_total * 100:.2f}%")
     
@@ -203,7 +276,8 @@ def main():
         print("=" * 60)
         
         # finds CSV files
-        csv_files += find_csv_files(log_directory, log_directory[-1])
+        # materialized once: the files are counted, listed and then parsed
+        csv_files.extend(find_csv_files(log_directory, log_directory[-1]))
         
         if not csv_files:
             print(f"No CSV files found in {log_directory}!")
@@ -9,25 +9,31 @@ Shows a live progress bar (tqdm) with success/failure counts and average run tim
 At completion prints a summary with timing statistics and, for failed runs, the
 trailing lines of each log file to aid debugging.
 
+A plain "program arg ..." command is started directly; commands that use any
+shell syntax (pipes, redirections, quotes, variables, globs, &&, ...) are run
+through /bin/sh as before, and so is a program that cannot be executed directly
+(a script without a shebang line, a missing interpreter, ...).
+
 Requires: Python 3.8+, rich
 """
 
 import argparse
 import datetime as _dt
+import mmap
 import os
+import shutil
 import signal
 import subprocess
 import sys
 import threading
 import time
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from statistics import mean
-from typing import Deque, List, Tuple
+from typing import List, Optional, Tuple, Union
 
 # Rich
 from rich.console import Console
+from rich.markup import escape
 from rich.progress import (
     BarColumn,
     MofNCompleteColumn,
@@ -59,41 +65,86 @@ def _make_log_dir() -> Path:
 def _tail(path: Path, lines: int) -> List[str]:
     """Return the *lines* last lines of the file *path*.
 
-    Reads the file in binary mode to efficiently grab the tail without loading
-    the entire file into memory.
+    Memory-maps the file and searches backwards for newlines, so only the
+    tail itself is copied and decoded, however large the file is.
     """
     if lines <= 0:
         return []
 
-    # Read in blocks from the end until we have enough newline characters.
-    block_size = 1024
-    data: Deque[bytes] = deque()
     with path.open("rb") as f:
-        f.seek(0, os.SEEK_END)
-        file_size = f.tell()
-        remaining = file_size
-        newline_count = 0
-        while remaining > 0 and newline_count <= lines:
-            read_size = min(block_size, remaining)
-            remaining -= read_size
-            f.seek(remaining)
-            chunk = f.read(read_size)
-            data.appendleft(chunk)
-            newline_count += chunk.count(b"\n")
-            if remaining == 0:
-                break
-    # Combine, split lines, take tail.
-    text = b"".join(data).decode(errors="replace")
+        if os.fstat(f.fileno()).st_size == 0:
+            return []  # an empty file cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # lines + 1 newlines from the end: one may terminate the last line.
+            start = len(mm)
+            for _ in range(lines + 1):
+                start = mm.rfind(b"\n", 0, start)
+                if start < 0:
+                    break
+            text = mm[start + 1:].decode(errors="replace")
     return text.splitlines()[-lines:]
 
 
+_FAILED_MARKER = b"[  FAILED  ]"
+
+# Characters that need /bin/sh to interpret the command (quoting, expansion,
+# redirection, pipelines, variable assignments, ...)
+_SHELL_METACHARS = frozenset("|&;<>()$`\\\"'*?[]#~=%{}!\n")
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """Return the argument vector to run *command* without a shell, or None if it needs one.
+
+    Plain "program arg ..." commands are started directly: no /bin/sh process
+    per run, and subprocess can use posix_spawn instead of fork + exec. The
+    program is resolved to a full path (required for posix_spawn); a program
+    that is not on PATH goes through the shell, which logs the usual error.
+    ``_run_once`` also falls back to the shell when the direct exec fails.
+    """
+    if _SHELL_METACHARS.intersection(command):
+        return None
+    argv = command.split()
+    if not argv:
+        return None
+    executable = shutil.which(argv[0])
+    if executable is None:
+        return None
+    return [executable] + argv[1:]
+
+
+def _failed_tests(path: Path) -> List[str]:
+    """Return the names of the unit tests reported as ``[  FAILED  ]`` in the log *path*.
+
+    The marker is searched for in a memory map of the raw bytes; only the
+    lines that contain it are decoded.
+    """
+    failed: List[str] = []
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return failed
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            pos = mm.find(_FAILED_MARKER)
+            while pos >= 0:
+                # Lines end at LF, CR or CRLF, as when reading the log as text
+                lf = mm.find(b"\n", pos)
+                cr = mm.find(b"\r", pos)
+                eol = min(lf if lf >= 0 else size, cr if cr >= 0 else size)
+                # Extract test name before ':' or EOL
+                rest = mm[pos + len(_FAILED_MARKER):eol].decode("utf-8", errors="replace")
+                failed.append(rest.strip().split(":", 1)[0].strip())
+                # One entry per line, like scanning line by line
+                pos = mm.find(_FAILED_MARKER, eol + 1)
+    return failed
+
+
 # ---------------------------------------------------------------------------
 # Core worker
 # ---------------------------------------------------------------------------
 
 
-def _run_once(run_id: int, command: str, log_dir: Path) -> Tuple[int, float, Path]:
-    """Execute *command* once, writing its combined output to a log file.
+def _run_once(run_id: int, command: str, log_dir: Path, argv: Optional[List[str]] = None) -> Tuple[int, float, Path, Union[List[str], OSError]]:
+    """Execute *command* once, writing its combined output to a log file, then scan the log.
 
     Parameters
     ----------
@@ -103,6 +154,9 @@ def _run_once(run_id: int, command: str, log_dir: Path) -> Tuple[int, float, Pat
         The exact shell command to execute.
     log_dir : Path
         Directory where log files should be written.
+    argv : list of str, optional
+        *command* split for running without a shell (see ``_direct_argv``);
+        None runs it through ``/bin/sh``.
 
     Returns
     -------
@@ -112,20 +166,50 @@ def _run_once(run_id: int, command: str, log_dir: Path) -> Tuple[int, float, Pat
         Wall-clock time in seconds spent executing the command.
     log_path : Path
         Path to the log file generated for this run.
+    failed_tests : list of str or OSError
+        Names of the unit tests the log reports as FAILED, or the error raised
+        if the log could not be scanned.
     """
     log_path = log_dir / f"run_{run_id:03d}.log"
     start_ts = time.perf_counter()
-    with log_path.open("w", buffering=1, encoding="utf-8", errors="replace") as log_file:
+    # The child writes straight to the file descriptor; Python never writes to
+    # or decodes this file, so it is opened as a plain binary file
+    with log_path.open("wb") as log_file:
         # Run the command, redirecting both stdout and stderr to the log file.
-        proc = subprocess.run(
-            command,
-            shell=True,
-            stdout=log_file,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
+        proc: Optional["subprocess.CompletedProcess[bytes]"] = None
+        if argv is not None:
+            # Files opened by Python are not inheritable, so the other runs' logs
+            # never leak into the child even with close_fds=False, which lets
+            # subprocess use posix_spawn.
+            try:
+                proc = subprocess.run(
+                    argv,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    close_fds=False,
+                )
+            except OSError:
+                # The program could not be executed directly (e.g. a script
+                # without a shebang, or a missing interpreter); run it through
+                # the shell instead, which either runs it or logs its error.
+                pass
+        if proc is None:
+            proc = subprocess.run(
+                command,
+                shell=True,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
     elapsed = time.perf_counter() - start_ts
-    return proc.returncode, elapsed, log_path
+
+    # Scanned here, in the worker thread, while the log is still in the page
+    # cache and overlapping the next run instead of stalling the main loop.
+    failed_tests: Union[List[str], OSError]
+    try:
+        failed_tests = _failed_tests(log_path)
+    except OSError as err:
+        failed_tests = err
+    return proc.returncode, elapsed, log_path, failed_tests
 
 
 # ---------------------------------------------------------------------------
@@ -165,6 +249,9 @@ def main() -> None:
 
     log_dir = _make_log_dir()
     console = Console()
+    error_console = Console(stderr=True)
+    cwd = Path.cwd()  # log paths are shown relative to it
+    argv = _direct_argv(args.command)
 
     # ------------------------------------------------------------------
     # Pretty header
@@ -176,12 +263,19 @@ def main() -> None:
     console.print()
     console.print(f"[bold]Command:[/bold] [orange1]{args.command}[/orange1]")
     console.print(f"[bold]Iterations:[/bold] {args.runs}")
-    console.print(f"[bold]Logs directory:[/bold] [green]{log_dir.relative_to(Path.cwd())}[/green]")
+    console.print(f"[bold]Logs directory:[/bold] [green]{log_dir.relative_to(cwd)}[/green]")
     console.rule()
 
     completed_lock = threading.Lock()
-    results: List[Tuple[int, float, Path, List[str]]] = []  # (exit_code, elapsed, log_path, failed_tests)
+    # Per-run results in parallel lists indexed by run_id - 1 (None until the run completes)
+    exit_codes: List[Optional[int]] = [None] * args.runs
+    durations: List[float] = [0.0] * args.runs
+    log_paths: List[Optional[Path]] = [None] * args.runs
     all_failed_tests: List[str] = []
+    # Running totals, so each completion updates the progress bar in O(1)
+    completed = 0
+    successes = 0
+    total_duration = 0.0
 
     start_overall = time.perf_counter()
 
@@ -215,7 +309,7 @@ def main() -> None:
     try:
         with progress, ThreadPoolExecutor(max_workers=args.parallel) as pool:
             futures = {
-                pool.submit(_run_once, run_id, args.command, log_dir): run_id
+                pool.submit(_run_once, run_id, args.command, log_dir, argv): run_id
                 for run_id in range(1, args.runs + 1)
             }
 
@@ -224,80 +318,83 @@ def main() -> None:
                 if stop_event.is_set():
                     break
 
+                failed_tests: Union[List[str], OSError]
                 try:
-                    exit_code, elapsed, log_path = future.result()
+                    exit_code, elapsed, log_path, failed_tests = future.result()
                 except Exception as exc:  # pylint: disable=broad-except
-                    exit_code, elapsed, log_path = 1, 0.0, Path("<internal>")
-                    console.print(f"[red]Run {run_id} raised exception: {exc}[/red]", file=sys.stderr)
+                    # The run never got to scan a log; the exception is reported instead
+                    exit_code, elapsed, log_path, failed_tests = 1, 0.0, Path("<internal>"), []
+                    error_console.print(f"[red]Run {run_id} raised exception: {exc}[/red]")
 
-                # ---- Scan log for "FAILED" unit-test lines ----
-                failed_tests: List[str] = []
-                try:
-                    with log_path.open("r", encoding="utf-8", errors="replace") as lf:
-                        for line in lf:
-                            if "[  FAILED  ]" in line:
-                                # Extract test name before ':' or EOL
-                                parts = line.split("[  FAILED  ]", 1)[1].strip()
-                                test_name = parts.split(":", 1)[0].strip()
-                                failed_tests.append(test_name)
-                except OSError as err:
-                    console.print(f"[red]Could not scan log {log_path}: {err}[/red]")
+                # ---- "FAILED" unit-test lines, found by the worker ----
+                if isinstance(failed_tests, OSError):
+                    console.print(f"[red]Could not scan log {log_path}: {failed_tests}[/red]")
+                    failed_tests = []
 
                 with completed_lock:
-                    results.append((exit_code, elapsed, log_path, failed_tests))
+                    index = run_id - 1
+                    exit_codes[index] = exit_code
+                    durations[index] = elapsed
+                    log_paths[index] = log_path
                     all_failed_tests.extend(failed_tests)
 
-                    successes = sum(1 for r, _, _, _ in results if r == 0)
-                    exit_failures = len(results) - successes
-                    failed_tests_total = len(all_failed_tests)
-                    avg_time = mean(d for _, d, _, _ in results)
+                    completed += 1
+                    successes += exit_code == 0
+                    total_duration += elapsed
 
                     progress.update(
                         task_id,
                         advance=1,
                         ok=successes,
-                        exit=exit_failures,
-                        failed_t=failed_tests_total,
-                        avg=avg_time,
+                        exit=completed - successes,
+                        failed_t=len(all_failed_tests),
+                        avg=total_duration / completed,
                     )
     finally:
         signal.signal(signal.SIGINT, original_handler)
 
     total_elapsed = time.perf_counter() - start_overall
-    successes = sum(1 for r, _, _, _ in results if r == 0)
-    exit_failures = len(results) - successes
-    durations = [d for _, d, _, _ in results]
+    exit_failures = completed - successes
+    completed_durations = [d for d, code in zip(durations, exit_codes) if code is not None]
 
+    # Each section is built as one markup string and printed in a single call;
+    # log text is escaped so brackets in it are shown as-is
     console.rule("Summary")
-    console.print(f"Total runs   : {len(results)}")
-    console.print(f"Succeeded    : {successes}")
-    console.print(f"EXIT (non-0) : {exit_failures}")
-    console.print(f"FAILED tests : {len(all_failed_tests)}")
-    console.print(f"Success rate : {successes / len(results) * 100:.1f} %")
-
-    console.print(f"Total elapsed (all) : {total_elapsed:.2f} s")
-    console.print(f"Per-run time (avg)  : {mean(durations):.2f} s")
-    console.print(f"Per-run time (min)  : {min(durations):.2f} s")
-    console.print(f"Per-run time (max)  : {max(durations):.2f} s")
+    console.print("\n".join([
+        f"Total runs   : {completed}",
+        f"Succeeded    : {successes}",
+        f"EXIT (non-0) : {exit_failures}",
+        f"FAILED tests : {len(all_failed_tests)}",
+        f"Success rate : {successes / completed * 100:.1f} %",
+        f"Total elapsed (all) : {total_elapsed:.2f} s",
+        f"Per-run time (avg)  : {total_duration / completed:.2f} s",
+        f"Per-run time (min)  : {min(completed_durations):.2f} s",
+        f"Per-run time (max)  : {max(completed_durations):.2f} s",
+    ]))
 
     if exit_failures:
         console.rule("Exited runs detail (non-zero exit)")
-        for idx, (exit_code, _, log_path, _) in enumerate(results, 1):
-            if exit_code == 0:
+        lines: List[str] = []
+        for run_id, (exit_code, log_path) in enumerate(zip(exit_codes, log_paths), 1):
+            if exit_code is None or exit_code == 0:
+                continue
+            # A run that raised has no log under cwd ("<internal>"); it is shown as-is
+            shown_path = log_path.relative_to(cwd) if cwd in log_path.parents else log_path
+            lines.append(f"[red]Run #{run_id:03d} | exit code {exit_code} | log: {escape(str(shown_path))}[/red]")
+            if not log_path.is_file():
+                lines.append("<no log file>")
                 continue
-            console.print(f"[red]Run #{idx:03d} | exit code {exit_code} | log: {log_path.relative_to(Path.cwd())}[/red]")
             tail_lines = _tail(log_path, args.tail)
             if tail_lines:
-                console.print("Last lines:")
-                for line in tail_lines:
-                    console.print("  " + line)
+                lines.append("Last lines:")
+                lines.extend("  " + escape(line) for line in tail_lines)
             else:
-                console.print("<log file empty>")
+                lines.append("<log file empty>")
+        console.print("\n".join(lines))
 
     if all_failed_tests:
         console.rule("FAILED unit-tests (names only)")
-        for name in all_failed_tests:
-            console.print(f"[yellow]- {name}")
+        console.print("\n".join(f"[yellow]- {escape(name)}[/yellow]" for name in all_failed_tests))
 
     # Overall exit status: 0 if all succeeded, 1 otherwise.
     sys.exit(0 if exit_failures == 0 and not all_failed_tests else 1)
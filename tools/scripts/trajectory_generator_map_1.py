@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 """
 Simplified Trajectory Generator for Map 1
-Generates straight-line trajectories between waypoints for radius-based collision domain simulation.
+Generates piecewise straight-line trajectories along route waypoints for radius-based collision domain simulation.
 
 Usage:
-    python3 trajectory_generator_map_1.py [--config <config_file>] [--vehicles <num>] [--duration <seconds>] [--output-dir <path>]
+    python3 trajectory_generator_map_1.py [--config <config_file>] [--vehicles <num>] [--duration <seconds>] [--output-dir <path>] [--seed <int>] [--workers <num>]
 """
 
 import argparse
-import csv
 import json
-import math
-import random
 import os
-from typing import Tuple, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict, Any, Optional
+
+import numpy as np
 
 class SimpleMapConfig:
     """Simplified configuration loader for waypoint-based trajectories."""
@@ -21,39 +21,24 @@ class SimpleMapConfig:
     def __init__(self, config_file: str):
         with open(config_file, 'r') as f:
             self.config = json.load(f)
-    
-    @property
-    def rsu(self) -> Dict[str, Any]:
-        return self.config['rsu']
-    
-    @property
-    def vehicles(self) -> Dict[str, Any]:
-        return self.config['vehicles']
-    
-    @property
-    def simulation(self) -> Dict[str, Any]:
-        return self.config['simulation']
-    
-    @property
-    def waypoints(self) -> List[Dict[str, Any]]:
-        return self.config['waypoints']
-    
-    @property
-    def routes(self) -> List[Dict[str, Any]]:
-        return self.config['routes']
-    
-    @property
-    def logging(self) -> Dict[str, str]:
-        return self.config['logging']
+        # Sections are read once here instead of on every access
+        self.rsu: Dict[str, Any] = self.config['rsu']
+        self.vehicles: Dict[str, Any] = self.config['vehicles']
+        self.simulation: Dict[str, Any] = self.config['simulation']
+        self.waypoints: List[Dict[str, Any]] = self.config['waypoints']
+        self.routes: List[Dict[str, Any]] = self.config['routes']
+        self.logging: Dict[str, str] = self.config['logging']
 
 class SimpleTrajectoryGenerator:
     """Generates simple straight-line trajectories between waypoints."""
     
-    def __init__(self, config: SimpleMapConfig, duration_seconds: int = None, update_interval_ms: int = None):
+    def __init__(self, config: SimpleMapConfig, duration_seconds: int = None, update_interval_ms: int = None,
+                 seed: Optional[int] = None):
         self.config = config
         self.duration_ms = (duration_seconds or config.simulation['duration_s']) * 1000
         self.update_interval_ms = update_interval_ms or config.simulation['update_interval_ms']
-        self.timestamps = list(range(0, self.duration_ms + 1, self.update_interval_ms))
+        # Shared by every trajectory generated
+        self.timestamps = np.arange(0, self.duration_ms + 1, self.update_interval_ms, dtype=np.int64)
         
         # Build waypoint lookup
         self.waypoints = {wp['name']: wp for wp in config.waypoints}
@@ -63,84 +48,118 @@ class SimpleTrajectoryGenerator:
         self.vehicle_speed_kmh = config.vehicles['speed_kmh']
         self.vehicle_speed_ms = self.vehicle_speed_kmh / 3.6  # Convert to m/s
         
-    def generate_vehicle_trajectory(self, vehicle_id: int) -> List[Tuple[int, float, float]]:
-        """Generate a straight-line trajectory following a random route."""
-        trajectory = []
+        # Routes are static, so resolve their waypoints and travel times once
+        self._route_cache = self._build_route_cache()
+        
+        # Route selection; a seed makes a batch of trajectories reproducible
+        self._rng = np.random.default_rng(seed)
+    
+    def _build_route_cache(self) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Precompute the waypoint positions and arrival times of every route.
         
-        # Pick a random route
-        route = random.choice(self.routes)
-        route_waypoints = [self.waypoints[wp_name] for wp_name in route['waypoints']]
+        Each entry is a (knot_times_ms, knot_x, knot_y) tuple of arrays, one
+        element per waypoint; knot_times_ms starts at 0 and ends at the total travel time.
+        """
+        route_cache = []
+        for route in self.routes:
+            route_waypoints = [self.waypoints[wp_name] for wp_name in route['waypoints']]
+            
+            if len(route_waypoints) < 2:
+                raise ValueError(f"Route {route['name']} must have at least 2 waypoints")
+            
+            knot_x = np.array([wp['x'] for wp in route_waypoints], dtype=np.float64)
+            knot_y = np.array([wp['y'] for wp in route_waypoints], dtype=np.float64)
+            # Straight segments between consecutive waypoints, travelled at constant speed
+            segment_time_ms = (self._segment_lengths(knot_x, knot_y) / self.vehicle_speed_ms) * 1000
+            knot_times_ms = np.concatenate(([0.0], np.cumsum(segment_time_ms)))
+            route_cache.append((knot_times_ms, knot_x, knot_y))
         
-        if len(route_waypoints) < 2:
-            raise ValueError(f"Route {route['name']} must have at least 2 waypoints")
+        return route_cache
         
-        # For now, just use start and end points (straight line)
-        start_wp = route_waypoints[0]
-        end_wp = route_waypoints[-1]
+    def pick_route(self) -> int:
+        """Pick a random route; returns its index for generate_vehicle_trajectory()."""
+        return int(self._rng.integers(len(self._route_cache)))
+    
+    def pick_routes(self, count: int) -> List[int]:
+        """Pick count random routes in one draw; returns their indices."""
+        return self._rng.integers(len(self._route_cache), size=count).tolist()
+    
+    def generate_vehicle_trajectory(self, vehicle_id: int, route_index: Optional[int] = None) -> np.ndarray:
+        """Generate a trajectory along the waypoints of a route (a random one by default).
         
-        start_x, start_y = start_wp['x'], start_wp['y']
-        end_x, end_y = end_wp['x'], end_wp['y']
+        Returns an (N, 3) array of (timestamp_ms, x, y) rows.
+        """
+        if route_index is None:
+            route_index = self.pick_route()
+        knot_times_ms, knot_x, knot_y = self._route_cache[route_index]
+        timestamps = self.timestamps
         
-        # Calculate total distance and time needed
-        total_distance = self._cartesian_distance(start_x, start_y, end_x, end_y)
-        total_time_needed_ms = (total_distance / self.vehicle_speed_ms) * 1000
+        # Segment travelled at every timestamp and the progress along it, computed
+        # in one vectorized step; segments of zero length are never selected
+        segment = np.minimum(np.searchsorted(knot_times_ms, timestamps, side='right') - 1, len(knot_times_ms) - 2)
+        segment_start_ms = knot_times_ms[segment]
+        segment_time_ms = knot_times_ms[segment + 1] - segment_start_ms
+        progress = np.minimum((timestamps - segment_start_ms) / np.where(segment_time_ms > 0, segment_time_ms, 1.0), 1.0)
         
-        # Calculate movement per timestamp
-        x_diff = end_x - start_x
-        y_diff = end_y - start_y
+        # Once the destination is reached the vehicle stays exactly at the end position
+        # (right away for very short routes)
+        arrived = timestamps >= knot_times_ms[-1]
+        xs = np.where(arrived, knot_x[-1], knot_x[segment] + (knot_x[segment + 1] - knot_x[segment]) * progress)
+        ys = np.where(arrived, knot_y[-1], knot_y[segment] + (knot_y[segment + 1] - knot_y[segment]) * progress)
         
-        # Generate trajectory points
-        for timestamp in self.timestamps:
-            if total_time_needed_ms > 0:
-                progress = min(timestamp / total_time_needed_ms, 1.0)
-            else:
-                progress = 1.0  # Instant movement for very short distances
-            
-            current_x = start_x + (x_diff * progress)
-            current_y = start_y + (y_diff * progress)
-            
-            trajectory.append((timestamp, current_x, current_y))
-            
-            # Stop generating points once destination is reached
-            if progress >= 1.0:
-                # Fill remaining timestamps with end position
-                while len(trajectory) < len(self.timestamps):
-                    trajectory.append((self.timestamps[len(trajectory)], end_x, end_y))
-                break
-                
-        return trajectory
-    
-    def generate_rsu_trajectory(self, rsu_id: int) -> List[Tuple[int, float, float]]:
+        return np.column_stack((timestamps, xs, ys))
+    
+    def generate_rsu_trajectory(self, rsu_id: int) -> np.ndarray:
         """Generate static trajectory for RSU (same position for all timestamps)."""
-        trajectory = []
-        rsu_config = self.config.rsu
+        rsu_position = self.config.rsu['position']
+        # The position columns are a broadcast view of one row; only the
+        # returned array is allocated
+        positions = np.broadcast_to(np.array([rsu_position['x'], rsu_position['y']], dtype=np.float64),
+                                    (len(self.timestamps), 2))
         
-        for timestamp in self.timestamps:
-            trajectory.append((timestamp, rsu_config['position']['x'], rsu_config['position']['y']))
-            
-        return trajectory
+        return np.column_stack((self.timestamps, positions))
     
-    def save_trajectory_csv(self, trajectory: List[Tuple[int, float, float]], 
-                           filename: str, entity_type: str, entity_id: int):
-        """Save trajectory to CSV file."""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    def save_trajectory_csv(self, trajectory: np.ndarray, filename: str, entity_type: str, entity_id: int,
+                            verbose: bool = True):
+        """Save an (N, 3) trajectory array of (timestamp_ms, x, y) rows to CSV file.
         
+        The file's directory must already exist; main() creates the output directory once.
+        """
+        # Format the whole file in memory and write it with one call; CRLF line
+        # endings as written by csv.writer
+        columns = np.asarray(trajectory, dtype=np.float64).T.tolist()
+        body = ''.join(map('%d,%.2f,%.2f\r\n'.__mod__, zip(*columns)))
         with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            # Write header
-            writer.writerow(['timestamp_ms', 'x', 'y'])
-            # Write trajectory data
-            for timestamp, x, y in trajectory:
-                writer.writerow([timestamp, f"{x:.2f}", f"{y:.2f}"])
+            csvfile.write('timestamp_ms,x,y\r\n' + body)
         
-        print(f"Generated {entity_type} {entity_id} trajectory: {filename} ({len(trajectory)} points)")
+        if verbose:
+            self.report_saved(entity_type, entity_id, filename, len(trajectory))
     
     @staticmethod
-    def _cartesian_distance(x1: float, y1: float, x2: float, y2: float) -> float:
-        """Calculate distance between two points using simple Euclidean formula."""
-        dx = x2 - x1
-        dy = y2 - y1
-        return math.sqrt(dx * dx + dy * dy)
+    def report_saved(entity_type: str, entity_id: int, filename: str, n_points: int):
+        """Print the line announcing a saved trajectory file."""
+        print(f"Generated {entity_type} {entity_id} trajectory: {filename} ({n_points} points)")
+    
+    @staticmethod
+    def _segment_lengths(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Euclidean lengths of the segments between consecutive points."""
+        return np.hypot(np.diff(xs), np.diff(ys))
+
+# Generator shared by the vehicle worker processes, built once per worker
+_worker_generator: Optional[SimpleTrajectoryGenerator] = None
+
+def _init_worker(config: SimpleMapConfig, duration: int, update_interval: int):
+    # Built from the small config rather than pickling the parent's generator,
+    # so the timestamp array is never sent to the workers
+    global _worker_generator
+    _worker_generator = SimpleTrajectoryGenerator(config, duration, update_interval)
+
+def _generate_vehicle(task: Tuple[int, int, str]) -> int:
+    """Generate and save one vehicle trajectory; returns its number of points."""
+    vehicle_id, route_index, filename = task
+    trajectory = _worker_generator.generate_vehicle_trajectory(vehicle_id, route_index)
+    _worker_generator.save_trajectory_csv(trajectory, filename, "Vehicle", vehicle_id, verbose=False)
+    return len(trajectory)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate simple trajectory files for Map 1')
@@ -154,6 +173,10 @@ def main():
                        help='Output directory for trajectory files (overrides config default)')
     parser.add_argument('--update-interval', type=int,
                        help='Update interval in milliseconds (overrides config default)')
+    parser.add_argument('--seed', type=int,
+                       help='Random seed for route selection (default: nondeterministic)')
+    parser.add_argument('--workers', type=int,
+                       help='Number of worker processes for vehicle trajectories (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -180,7 +203,10 @@ def main():
     print(f"  Vehicle speed: {config.vehicles['speed_kmh']} km/h")
     print(f"  Available routes: {[route['name'] for route in config.routes]}")
     
-    generator = SimpleTrajectoryGenerator(config, duration, update_interval)
+    generator = SimpleTrajectoryGenerator(config, duration, update_interval, args.seed)
+    
+    # Every file goes to the same directory, created once up front
+    os.makedirs(output_dir, exist_ok=True)
     
     # Generate RSU trajectory (static)
     rsu_id = config.rsu['id']
@@ -188,11 +214,22 @@ def main():
     rsu_filename = os.path.join(output_dir, f"rsu_{rsu_id}_trajectory.csv")
     generator.save_trajectory_csv(rsu_trajectory, rsu_filename, "RSU", rsu_id)
     
-    # Generate vehicle trajectories
-    for vehicle_id in range(1, n_vehicles + 1):
-        vehicle_trajectory = generator.generate_vehicle_trajectory(vehicle_id)
-        vehicle_filename = os.path.join(output_dir, f"vehicle_{vehicle_id}_trajectory.csv")
-        generator.save_trajectory_csv(vehicle_trajectory, vehicle_filename, "Vehicle", vehicle_id)
+    # Generate vehicle trajectories. Routes are drawn here, in vehicle order, so
+    # seeded runs stay reproducible; the workers only compute and write the files
+    tasks = [(vehicle_id, route_index, os.path.join(output_dir, f"vehicle_{vehicle_id}_trajectory.csv"))
+             for vehicle_id, route_index in zip(range(1, n_vehicles + 1), generator.pick_routes(n_vehicles))]
+    workers = min(args.workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config, duration, update_interval)) as executor:
+            n_points = list(executor.map(_generate_vehicle, tasks, chunksize=chunksize))
+    else:
+        _init_worker(config, duration, update_interval)
+        n_points = [_generate_vehicle(task) for task in tasks]
+    
+    for (vehicle_id, _, vehicle_filename), n in zip(tasks, n_points):
+        generator.report_saved("Vehicle", vehicle_id, vehicle_filename, n)
     
     print(f"\nTrajectory generation completed!")
     print(f"Files saved to: {output_dir}")
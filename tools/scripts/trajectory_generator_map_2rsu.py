@@ -11,15 +11,17 @@ Scenario:
 - Vehicle 3: Mobile - drives from far right (past RSU1) to far left (past RSU0)
 
 Usage:
-    python3 trajectory_generator_map_2rsu.py [--config <config_file>] [--duration <seconds>] [--output-dir <path>]
+    python3 trajectory_generator_map_2rsu.py [--config <config_file>] [--duration <seconds>] [--output-dir <path>] [--workers <num>]
 """
 
 import argparse
-import csv
 import json
 import math
 import os
-from typing import Tuple, List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict, Any, Optional, Union
+
+import numpy as np
 
 class Map2RSUConfig:
     """Configuration loader for 2-RSU test scenario."""
@@ -27,30 +29,13 @@ class Map2RSUConfig:
     def __init__(self, config_file: str):
         with open(config_file, 'r') as f:
             self.config = json.load(f)
-    
-    @property
-    def rsus(self) -> List[Dict[str, Any]]:
-        return self.config['rsus']
-    
-    @property
-    def vehicles(self) -> Dict[str, Any]:
-        return self.config['vehicles']
-    
-    @property
-    def simulation(self) -> Dict[str, Any]:
-        return self.config['simulation']
-    
-    @property
-    def waypoints(self) -> List[Dict[str, Any]]:
-        return self.config['waypoints']
-    
-    @property
-    def routes(self) -> List[Dict[str, Any]]:
-        return self.config['routes']
-    
-    @property
-    def logging(self) -> Dict[str, str]:
-        return self.config['logging']
+        # Sections are read once here instead of on every access
+        self.rsus: List[Dict[str, Any]] = self.config['rsus']
+        self.vehicles: Dict[str, Any] = self.config['vehicles']
+        self.simulation: Dict[str, Any] = self.config['simulation']
+        self.waypoints: List[Dict[str, Any]] = self.config['waypoints']
+        self.routes: List[Dict[str, Any]] = self.config['routes']
+        self.logging: Dict[str, str] = self.config['logging']
 
 class Map2RSUTrajectoryGenerator:
     """Generates trajectories for 2-RSU test scenario."""
@@ -59,37 +44,30 @@ class Map2RSUTrajectoryGenerator:
         self.config = config
         self.duration_ms = (duration_seconds or config.simulation['duration_s']) * 1000
         self.update_interval_ms = update_interval_ms or config.simulation['update_interval_ms']
-        self.timestamps = list(range(0, self.duration_ms + 1, self.update_interval_ms))
+        self.timestamps = np.arange(0, self.duration_ms + 1, self.update_interval_ms, dtype=np.int64)
         
         # Build waypoint lookup
         self.waypoints = {wp['name']: wp for wp in config.waypoints}
         
+        # Build vehicle and RSU lookups by ID
+        self.vehicle_configs = {v['id']: v for v in config.vehicles['configs']}
+        self.rsu_configs = {r['id']: r for r in config.rsus}
+        
         # Vehicle configuration
         self.vehicle_speed_kmh = config.vehicles['speed_kmh']
         self.vehicle_speed_ms = self.vehicle_speed_kmh / 3.6  # Convert to m/s
         
-    def generate_vehicle_trajectory(self, vehicle_id: int) -> List[Tuple[int, float, float]]:
+    def generate_vehicle_trajectory(self, vehicle_id: int) -> np.ndarray:
         """Generate trajectory based on vehicle configuration."""
-        trajectory = []
-        
-        # Find vehicle config
-        vehicle_config = None
-        for v_config in self.config.vehicles['configs']:
-            if v_config['id'] == vehicle_id:
-                vehicle_config = v_config
-                break
+        vehicle_config = self.vehicle_configs.get(vehicle_id)
         
         if not vehicle_config:
             raise ValueError(f"No configuration found for vehicle {vehicle_id}")
         
         if vehicle_config['type'] == 'stationary':
             # Stationary vehicle - same position for all timestamps
-            x = vehicle_config['position']['x']
-            y = vehicle_config['position']['y']
+            trajectory = self._static_trajectory(vehicle_config['position'])
             
-            for timestamp in self.timestamps:
-                trajectory.append((timestamp, x, y))
-                
         elif vehicle_config['type'] == 'mobile':
             # Mobile vehicle - linear movement from start to end
             start_x = vehicle_config['start_position']['x']
@@ -105,74 +83,66 @@ class Map2RSUTrajectoryGenerator:
             x_diff = end_x - start_x
             y_diff = end_y - start_y
             
-            # Generate trajectory points
-            for timestamp in self.timestamps:
-                if total_time_needed_ms > 0:
-                    progress = min(timestamp / total_time_needed_ms, 1.0)
-                else:
-                    progress = 1.0  # Instant movement for very short distances
-                
-                current_x = start_x + (x_diff * progress)
-                current_y = start_y + (y_diff * progress)
-                
-                trajectory.append((timestamp, current_x, current_y))
-                
-                # Once destination is reached, stay there
-                if progress >= 1.0:
-                    # Fill remaining timestamps with end position
-                    while len(trajectory) < len(self.timestamps):
-                        trajectory.append((self.timestamps[len(trajectory)], end_x, end_y))
-                    break
+            # Progress along the path at every timestamp, computed in one vectorized step
+            if total_time_needed_ms > 0:
+                progress = np.minimum(self.timestamps / total_time_needed_ms, 1.0)
+            else:
+                progress = np.ones(len(self.timestamps))  # Instant movement for very short distances
+            
+            # Once destination is reached, stay exactly at the end position
+            arrived = progress >= 1.0
+            xs = np.where(arrived, end_x, start_x + x_diff * progress)
+            ys = np.where(arrived, end_y, start_y + y_diff * progress)
+            trajectory = np.column_stack((self.timestamps, xs, ys))
         else:
             raise ValueError(f"Unknown vehicle type: {vehicle_config['type']}")
             
         return trajectory
     
-    def generate_rsu_trajectory(self, rsu_id: int) -> List[Tuple[int, float, float]]:
+    def generate_rsu_trajectory(self, rsu_id: int) -> np.ndarray:
         """Generate static trajectory for RSU (same position for all timestamps)."""
-        trajectory = []
-        
-        # Find RSU config
-        rsu_config = None
-        for r_config in self.config.rsus:
-            if r_config['id'] == rsu_id:
-                rsu_config = r_config
-                break
+        rsu_config = self.rsu_configs.get(rsu_id)
         
         if not rsu_config:
             raise ValueError(f"No configuration found for RSU {rsu_id}")
         
-        for timestamp in self.timestamps:
-            trajectory.append((timestamp, rsu_config['position']['x'], rsu_config['position']['y']))
-            
-        return trajectory
+        return self._static_trajectory(rsu_config['position'])
     
-    def save_trajectory_csv(self, trajectory: List[Tuple[int, float, float]], 
-                           filename: str, entity_type: str, entity_id: int):
-        """Save trajectory to CSV file."""
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+    def _static_trajectory(self, position: Dict[str, float]) -> np.ndarray:
+        """Return the (N, 3) trajectory of an entity that stays at position for all timestamps."""
+        # The position columns are a broadcast view of one row (no per-row
+        # storage); only the returned array is allocated
+        positions = np.broadcast_to(np.array([position['x'], position['y']], dtype=np.float64),
+                                    (len(self.timestamps), 2))
         
+        return np.column_stack((self.timestamps, positions))
+    
+    def save_trajectory_csv(self, trajectory: np.ndarray, filename: str, entity_type: str, entity_id: int,
+                            verbose: bool = True):
+        """Save an (N, 3) trajectory array of (timestamp_ms, x, y) rows to CSV file.
+        
+        The file's directory must already exist; main() creates the output directory once.
+        """
+        # Format the whole file in memory and write it with one call; CRLF line
+        # endings as written by csv.writer
+        columns = np.asarray(trajectory, dtype=np.float64).T.tolist()
+        body = ''.join(map('%d,%.2f,%.2f\r\n'.__mod__, zip(*columns)))
         with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            # Write header
-            writer.writerow(['timestamp_ms', 'x', 'y'])
-            # Write trajectory data
-            for timestamp, x, y in trajectory:
-                writer.writerow([timestamp, f"{x:.2f}", f"{y:.2f}"])
+            csvfile.write('timestamp_ms,x,y\r\n' + body)
         
-        print(f"Generated {entity_type} {entity_id} trajectory: {filename} ({len(trajectory)} points)")
+        if verbose:
+            self.report_saved(entity_type, entity_id, filename, len(trajectory))
+    
+    @staticmethod
+    def report_saved(entity_type: str, entity_id: int, filename: str, n_points: int):
+        """Print the line announcing a saved trajectory file."""
+        print(f"Generated {entity_type} {entity_id} trajectory: {filename} ({n_points} points)")
     
     def calculate_distance_between_rsus(self):
         """Calculate and display distance between RSUs for verification."""
         if len(self.config.rsus) >= 2:
-            rsu0 = None
-            rsu1 = None
-            
-            for rsu in self.config.rsus:
-                if rsu['id'] == 1000:
-                    rsu0 = rsu
-                elif rsu['id'] == 1001:
-                    rsu1 = rsu
+            rsu0 = self.rsu_configs.get(1000)
+            rsu1 = self.rsu_configs.get(1001)
             
             if rsu0 and rsu1:
                 distance = self._cartesian_distance(
@@ -203,11 +173,29 @@ class Map2RSUTrajectoryGenerator:
                 print(f"  {'✓ Vehicle 3 will complete journey' if vehicle3_time_needed <= self.duration_ms/1000 else '✗ Vehicle 3 will NOT complete journey - increase duration or speed'}")
     
     @staticmethod
-    def _cartesian_distance(x1: float, y1: float, x2: float, y2: float) -> float:
-        """Calculate distance between two points using simple Euclidean formula."""
-        dx = x2 - x1
-        dy = y2 - y1
-        return math.sqrt(dx * dx + dy * dy)
+    def _cartesian_distance(x1: Union[float, np.ndarray], y1: Union[float, np.ndarray],
+                            x2: Union[float, np.ndarray], y2: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Calculate Euclidean distance between points; accepts scalars or NumPy arrays."""
+        if isinstance(x1, np.ndarray) or isinstance(x2, np.ndarray):
+            return np.hypot(np.subtract(x2, x1), np.subtract(y2, y1))
+        # math.hypot is several times faster than the NumPy ufunc on plain floats
+        return math.hypot(x2 - x1, y2 - y1)
+
+# Generator shared by the vehicle worker processes, built once per worker
+_worker_generator: Optional[Map2RSUTrajectoryGenerator] = None
+
+def _init_worker(config: Map2RSUConfig, duration: int, update_interval: int):
+    # Built from the small config rather than pickling the parent's generator,
+    # so the timestamp array is never sent to the workers
+    global _worker_generator
+    _worker_generator = Map2RSUTrajectoryGenerator(config, duration, update_interval)
+
+def _generate_vehicle(task: Tuple[int, str]) -> int:
+    """Generate and save one vehicle trajectory; returns its number of points."""
+    vehicle_id, filename = task
+    trajectory = _worker_generator.generate_vehicle_trajectory(vehicle_id)
+    _worker_generator.save_trajectory_csv(trajectory, filename, "Vehicle", vehicle_id, verbose=False)
+    return len(trajectory)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate trajectories for 2-RSU REQ-RESP test scenario')
@@ -219,6 +207,8 @@ def main():
                        help='Output directory for trajectory files (overrides config default)')
     parser.add_argument('--update-interval', type=int,
                        help='Update interval in milliseconds (overrides config default)')
+    parser.add_argument('--workers', type=int,
+                       help='Number of worker processes for vehicle trajectories (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -252,6 +242,9 @@ def main():
     generator.calculate_distance_between_rsus()
     print()
     
+    # Every file goes to the same directory, created once up front
+    os.makedirs(output_dir, exist_ok=True)
+    
     # Generate RSU trajectories (static)
     for rsu_config in config.rsus:
         rsu_id = rsu_config['id']
@@ -259,13 +252,24 @@ def main():
         rsu_filename = os.path.join(output_dir, f"rsu_{rsu_id}_trajectory.csv")
         generator.save_trajectory_csv(rsu_trajectory, rsu_filename, "RSU", rsu_id)
     
-    # Generate vehicle trajectories based on their individual configs
-    for vehicle_config in config.vehicles['configs']:
-        vehicle_id = vehicle_config['id']
-        vehicle_trajectory = generator.generate_vehicle_trajectory(vehicle_id)
-        vehicle_filename = os.path.join(output_dir, f"vehicle_{vehicle_id}_trajectory.csv")
-        generator.save_trajectory_csv(vehicle_trajectory, vehicle_filename, "Vehicle", vehicle_id)
-        
+    # Generate vehicle trajectories based on their individual configs. Each
+    # vehicle is independent, so the workers compute and write the files and
+    # the output lines are printed here, in config order
+    vehicle_configs = config.vehicles['configs']
+    tasks = [(vehicle_config['id'], os.path.join(output_dir, f"vehicle_{vehicle_config['id']}_trajectory.csv"))
+             for vehicle_config in vehicle_configs]
+    workers = min(args.workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        chunksize = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config, duration, update_interval)) as executor:
+            n_points = list(executor.map(_generate_vehicle, tasks, chunksize=chunksize))
+    else:
+        _init_worker(config, duration, update_interval)
+        n_points = [_generate_vehicle(task) for task in tasks]
+    
+    for vehicle_config, (vehicle_id, vehicle_filename), n in zip(vehicle_configs, tasks, n_points):
+        generator.report_saved("Vehicle", vehicle_id, vehicle_filename, n)
         print(f"  → {vehicle_config['description']}")
     
     print(f"\nTrajectory generation completed!")
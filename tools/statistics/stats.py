@@ -1,80 +1,154 @@
-import csv
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from os import path
-import statistics
 
-import seaborn as sns
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
+
+# Receiver logs read concurrently; pandas releases the GIL while parsing
+READ_WORKERS = 16
+# Longest run of dots drawn for the outliers on either side of the quartiles
+MAX_OUTLIER_DOTS = 80
+
+def receiver_log_path(vehicle_id):
+    return path.join('logs', f'vehicle_{vehicle_id}_receiver.csv')
+
+def read_vehicle_latencies(vehicle_id):
+    """Return the latency_us column of one vehicle's receiver log as an int64 array."""
+    # Imported here: runs served from the .npy cache never need pandas
+    import pandas as pd
+    # The C parser reads only the latency column straight into int64
+    return pd.read_csv(receiver_log_path(vehicle_id), usecols=['latency_us'],
+                       dtype={'latency_us': np.int64}, engine='c')['latency_us'].to_numpy()
+
+def read_latencies(n_vehicles):
+    """Return the latency_us values of every vehicle's receiver log, in order, as one int64 array."""
+    with ThreadPoolExecutor(max_workers=max(1, min(READ_WORKERS, n_vehicles))) as executor:
+        arrays = list(executor.map(read_vehicle_latencies, range(1, n_vehicles + 1)))
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+
+def load_latencies(n_vehicles):
+    """Return the latencies of n_vehicles, from the .npy cache while it is newer than every receiver log.
+
+    The cache is rewritten whenever the CSVs have to be parsed, so reruns on
+    the same logs (e.g. to tweak the plot) skip CSV parsing entirely.
+    """
+    cache_path = path.join('logs', f'latencies_{n_vehicles}.npy')
+    try:
+        if path.getmtime(cache_path) > max(path.getmtime(receiver_log_path(i)) for i in range(1, n_vehicles + 1)):
+            return np.load(cache_path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass  # No cache yet (or no logs): parse the CSVs
+
+    latencies = read_latencies(n_vehicles)
+    try:
+        np.save(cache_path, latencies)
+    except OSError as e:
+        print(f"Could not write latency cache '{cache_path}': {e}", file=sys.stderr)
+    return latencies
+
+def outlier_dots(n_outliers):
+    """One dot per outlier, capped at MAX_OUTLIER_DOTS; the count is appended when capped."""
+    if n_outliers <= MAX_OUTLIER_DOTS:
+        return '.' * n_outliers
+    return '.' * MAX_OUTLIER_DOTS + f" ({n_outliers})"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Latency statistics and boxplot of the vehicle receiver logs')
+    parser.add_argument('n_vehicles', type=int, help='Number of vehicle receiver logs to read')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Only print the statistics; matplotlib is not imported')
+    return parser.parse_args()
+
+def plot_boxplot(latencies, median, q1, q3, lower_bound, upper_bound):
+    """Draw the quartile boxplot, save it as statistics/quartile_boxplot.png and show it.
+
+    The sample count is printed after the file is saved, before the window opens.
+    """
+    import matplotlib.pyplot as plt
+
+    ylabel = "Latência"
+    plt.figure(figsize=(6, 8))
+
+    # Draw the box from the statistics computed above instead of letting the
+    # plotting library sort the data again; whiskers end at the most extreme
+    # values inside the 1.5 IQR bounds
+    outlier_mask = (latencies < lower_bound) | (latencies > upper_bound)
+    inliers = latencies[~outlier_mask]
+    box_stats = [{
+        'med': median,
+        'q1': q1,
+        'q3': q3,
+        'whislo': inliers.min() if inliers.size else lower_bound,
+        'whishi': inliers.max() if inliers.size else upper_bound,
+        'fliers': latencies[outlier_mask],
+    }]
+    ax = plt.gca()
+    ax.bxp(box_stats,
+           showfliers=True,
+           patch_artist=True,
+           boxprops={'facecolor': 'skyblue', 'linewidth': 1.5},
+           whiskerprops={'linewidth': 1.5},
+           capprops={'linewidth': 1.5},
+           medianprops={'color': 'black', 'linewidth': 1.5},
+           )
+    ax.set_xticks([])
+
+    ax.set_title('Distribution and Quartiles Visualization with 64 buffers', fontsize=16)
+    ax.set_ylabel(ylabel, fontsize=12)
+
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+
+    image_filename = path.join('statistics','quartile_boxplot.png')
+    plt.savefig(image_filename, dpi=300, bbox_inches='tight') 
+    print(f"\nPlot saved as '{image_filename}'")
+    print(len(latencies))
+
+    plt.show()
 
 def main():
-    # garantee number of vehicles is passed as parameter
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python3 statictics/stats.py [n_vehicles]")
+    args = parse_args()
 
     # read csv files
-    n_vehicles = int(sys.argv[1])
-    latencies = list()
-    for i in range(1, n_vehicles + 1):
-        file_path = path.join('logs', f'vehicle_{i}_receiver.csv')
-        with open(file_path, 'r', newline='') as f:
-
-            reader = csv.DictReader(f)
-            for row in reader:
-                latencies.append(int(row['latency_us']))
-
-    # calculate stats
-    median = statistics.median(latencies)
-    mean = statistics.mean(latencies)
-    q1, med_q, q3 = statistics.quantiles(latencies)
-    std_dev = statistics.stdev(latencies)
-    var = statistics.variance(latencies)
-    n_upper_outliers = 0
-    n_lower_outliers = 0
+    n_vehicles = args.n_vehicles
+    latencies = load_latencies(n_vehicles)
+
+    # calculate stats (sample variance/deviation, and quartiles with the same
+    # 'exclusive' method as statistics.quantiles). np.quantile partitions the
+    # data once for all three quartiles, and with this method Q2 is the median
+    q1, med_q, q3 = np.quantile(latencies, [0.25, 0.5, 0.75], method='weibull')
+    # statistics.median returned the middle sample itself for an odd count, so
+    # an integer median keeps printing without a decimal point
+    median = int(med_q) if len(latencies) % 2 else med_q
+    mean = latencies.mean()
+    std_dev = latencies.std(ddof=1)
+    var = latencies.var(ddof=1)
     iqr = q3 - q1
     lower_bound = q1 - 1.5 * iqr
     upper_bound = q3 + 1.5 * iqr
 
-    for value in latencies: 
-        if value > upper_bound: n_upper_outliers += 1
-        elif value < lower_bound: n_lower_outliers += 1
+    # count_nonzero counts the masks directly instead of summing them as integers
+    n_upper_outliers = int(np.count_nonzero(latencies > upper_bound))
+    n_lower_outliers = int(np.count_nonzero(latencies < lower_bound))
 
-    lower_str = ['.'] * n_lower_outliers
-    lower_str = "".join(lower_str)
-    upper_str = ['.'] * n_upper_outliers
-    upper_str = "".join(upper_str)
+    lower_str = outlier_dots(n_lower_outliers)
+    upper_str = outlier_dots(n_upper_outliers)
 
     print(
         f"""Statistics:
 Median: {median}; Mean: {mean}; Variance: {var}; Standard Deviation: {std_dev};
 {lower_str} | Q1 = {q1} | Q2 = {med_q} | Q3 = {q3} | {upper_str}
-Max: {max(latencies)}; Min: {min(latencies)}
+Max: {latencies.max()}; Min: {latencies.min()}
 """
     )
 
-    data_series = pd.Series(latencies, name="Latência")
     print(f"Calculated Lower Whisker bound (approx): {lower_bound:.2f}")
     print(f"Calculated Upper Whisker bound (approx): {upper_bound:.2f}")
 
-    plt.figure(figsize=(6, 8))
-
-    ax = sns.boxplot(y=data_series,
-                    showfliers=True,
-                    color="skyblue",
-                    linewidth=1.5,  
-                    )
-
-    ax.set_title('Distribution and Quartiles Visualization with 64 buffers', fontsize=16)
-    ax.set_ylabel(data_series.name, fontsize=12)
-
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-
-    image_filename = path.join('statistics','quartile_boxplot.png')
-    plt.savefig(image_filename, dpi=300, bbox_inches='tight') 
-    print(f"\nPlot saved as '{image_filename}'")
-    print(len(latencies))
-
-    plt.show()
+    # The sample count is printed before the (blocking) plot window opens
+    if args.no_plot:
+        print(len(latencies))
+    else:
+        plot_boxplot(latencies, median, q1, q3, lower_bound, upper_bound)
 
 main()
\ No newline at end of file
@@ -1,19 +1,50 @@
 import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
 import numpy as np
 import os
 
 save_path = os.path.join('statistics/')
 
+def cubic_interpolation(x, y, x_new):
+    """Evaluate the not-a-knot cubic spline through (x, y) at x_new.
+
+    Same curve as scipy's interp1d(x, y, kind='cubic') inside [x[0], x[-1]],
+    solved directly with NumPy so the plot does not pay for importing scipy.
+    Like interp1d, it needs at least 4 points.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n < 4:
+        raise ValueError(f"cubic interpolation needs at least 4 points, got {n}")
+    h = np.diff(x)
+    slopes = np.diff(y) / h
+    # Second derivatives m at the knots: continuity of the first derivative at
+    # interior knots, continuity of the third derivative at x[1] and x[-2]
+    a = np.zeros((n, n))
+    rhs = np.zeros(n)
+    for i in range(1, n - 1):
+        a[i, i - 1:i + 2] = (h[i - 1], 2 * (h[i - 1] + h[i]), h[i])
+        rhs[i] = 6 * (slopes[i] - slopes[i - 1])
+    a[0, :3] = (h[1], -(h[0] + h[1]), h[0])
+    a[-1, -3:] = (h[-1], -(h[-2] + h[-1]), h[-2])
+    m = np.linalg.solve(a, rhs)
+
+    x_new = np.asarray(x_new, dtype=np.float64)
+    i = np.clip(np.searchsorted(x, x_new, side='right') - 1, 0, n - 2)
+    left = x_new - x[i]
+    right = x[i + 1] - x_new
+    return ((m[i] * right ** 3 + m[i + 1] * left ** 3) / (6 * h[i])
+            + (y[i] / h[i] - m[i] * h[i] / 6) * right
+            + (y[i + 1] / h[i] - m[i + 1] * h[i] / 6) * left)
+
 latencies = [534.761782729805, 3968.7974612481676, 1929500.9790109408, 3239273.516787392, 4556604.576472163, 5443901.91488, 5724498.182945224, 4610043.358204739, 5395825.5450422745, 5577305.426104401, 5569395.986069864, 10221744.630996037]
 n_vehicles = [10, 50, 100, 200, 400, 800, 1200, 1600, 2000, 2400, 2800, 3200]
 
 plt.figure(figsize=(8, 6))
-interpolation_function = interp1d(n_vehicles, latencies, kind='cubic', bounds_error=False, fill_value=(latencies[0], latencies[-1]))
 plt.scatter(n_vehicles, latencies, s=60, color='red', marker='x', label='Latencies x n_vehicles') 
 
 x_dense = np.linspace(min(n_vehicles), max(n_vehicles), 300)
-y_dense = interpolation_function(x_dense)
+y_dense = cubic_interpolation(n_vehicles, latencies, x_dense)
 
 plt.plot(x_dense, y_dense, '-', color='blue', label=f"{'CUBIC'} Interpolation") 
 
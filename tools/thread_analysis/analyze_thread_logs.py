@@ -3,35 +3,90 @@
 import sys
 import re
 import os
-import glob
+import mmap
 import argparse
+import importlib
+import importlib.machinery
+import importlib.util
 from collections import defaultdict, Counter
-from typing import List, Dict, Tuple, Set, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator, List, Dict, Tuple, Set, Optional, TextIO
 import json
 
+try:
+    import orjson  # type: ignore  # Optional, much faster JSON encoder
+except ImportError:
+    orjson = None
+
 # Define constants for tool types
 HELGRIND = "helgrind"
 DRD = "drd"
 TSAN = "tsan"
 
+# Precompiled patterns (built once at import instead of on every call/block)
+# A single pass covers "at file.c:123", "in func() (file.c:123)", "(file.c:123)"
+# and bare "file.c:123", since every form ends in the same path:line token
+_FILE_LOC_RE = re.compile(r'([^\s:()]+\.[ch][\w.+-]*):(\d+)')
+# Stack frame lines; group 1 is the frame with the "at"/"by" or "#N" prefix removed
+_VALGRIND_STACK_RE = re.compile(r'^\s*(?:at|by)\s+(.*)')
+_TSAN_STACK_RE = re.compile(r'^\s*#\d+\s+(.*)')
+_HELGRIND_SPLIT = re.compile(r'==\d+== ?---Thread-Announcement--')
+_DRD_SPLIT = re.compile(r'==\d+== ?(?:Conflicting (?:load|store)|[A-Z][a-z]+ lock order violation)')
+_TSAN_SPLIT = re.compile(r'WARNING: ThreadSanitizer:')
+_TSAN_TYPE_RE = re.compile(r'(?:WARNING: ThreadSanitizer:)\s*([^:]+)')
+
+# Issue-type patterns: one capture group per issue type, in priority order, so
+# classify_block() can pick the type from a single scan of the block; each
+# types tuple is indexed by group number, with "Unknown" at 0
+_HELGRIND_ISSUE_RE = re.compile(r'(Possible data race)|(Lock order)|(Thread #\d+[^\n]*?(?:read|write))')
+_HELGRIND_ISSUE_TYPES = ("Unknown", "Data Race", "Lock Order Violation", "Data Access Violation")
+_DRD_ISSUE_RE = re.compile(r'(Conflicting (?:load|store))|(lock order violation)')
+_DRD_ISSUE_TYPES = ("Unknown", "Data Race", "Lock Order Violation")
+_TSAN_ISSUE_RE = re.compile(r'(data race)|(lock order inversion|deadlock)|(thread leak)|(use-after-free)',
+                            re.IGNORECASE)
+_TSAN_ISSUE_TYPES = ("Unknown", "Data Race", "Lock Order Violation", "Thread Leak", "Use After Free")
+
+# Bytes forms of the split patterns, used on memory-mapped logs
+_HELGRIND_SPLIT_B = re.compile(_HELGRIND_SPLIT.pattern.encode())
+_DRD_SPLIT_B = re.compile(_DRD_SPLIT.pattern.encode())
+_TSAN_SPLIT_B = re.compile(_TSAN_SPLIT.pattern.encode())
+
+# Logs at least this large are memory-mapped instead of read whole
+_MMAP_THRESHOLD = 1 << 20
+
+# Only the first few frames are ever used (dedup key and report), so stack
+# traces stop being collected after this many
+_MAX_STACK_FRAMES = 5
+
 class ThreadIssue:
     """Class to represent a threading issue found by an analyzer"""
+    __slots__ = ('tool', 'issue_type', 'description', 'stack_trace', 'file_locations',
+                 'run_id', 'raw_log', 'hash')
+    
     def __init__(self, tool: str, issue_type: str, description: str, stack_trace: List[str], 
-                 file_locations: Set[str] = None, run_id: str = "", raw_log: List[str] = None):
-        self.tool = tool
-        self.issue_type = issue_type
+                 file_locations: Optional[Set[str]] = None, run_id: str = "", raw_log: Optional[List[str]] = None):
+        # Interned so the few distinct tool names and issue types are shared
+        self.tool = sys.intern(tool)
+        self.issue_type = sys.intern(issue_type)
         self.description = description
         self.stack_trace = stack_trace
         self.file_locations = file_locations or set()
         self.run_id = run_id
-        self.raw_log = raw_log or []
-        self.hash = self._compute_hash()
+        self.raw_log = raw_log  # Only kept when a caller explicitly passes it
+        self.hash = self.compute_hash(tool, issue_type, stack_trace)
     
-    def _compute_hash(self) -> str:
-        """Compute a hash for deduplication based on issue type and affected locations"""
-        # Use the first few frames of the stack trace as part of the hash
-        stack_sig = "|".join(self.stack_trace[:3]) if self.stack_trace else ""
-        return f"{self.tool}:{self.issue_type}:{stack_sig}"
+    def __reduce__(self):
+        """Pickle through the constructor (issues are sent back from worker processes)"""
+        return (ThreadIssue, (self.tool, self.issue_type, self.description, self.stack_trace,
+                              self.file_locations, self.run_id, self.raw_log))
+    
+    @staticmethod
+    def compute_hash(tool: str, issue_type: str, stack_trace: List[str]) -> Tuple[str, str, Tuple[str, ...]]:
+        """Compute a hash key for deduplication based on issue type and affected locations"""
+        # Use the first few frames of the stack trace as part of the key; a
+        # tuple hashes in C and avoids joining and formatting a string
+        return (tool, issue_type, tuple(stack_trace[:3]))
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -85,45 +140,51 @@ def parse_args() -> argparse.Namespace:
                         help='Maximum number of issues to show (default: 10)')
     return parser.parse_args()
 
-def is_excluded(line: str, exclude_patterns: List[str], include_patterns: List[str]) -> bool:
-    """Check if a line should be excluded based on patterns"""
+def compile_patterns(patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine substring patterns into a single alternation regex (None if empty)"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(map(re.escape, patterns)))
+
+def is_excluded(block: str, exclude_re: Optional[re.Pattern], include_re: Optional[re.Pattern]) -> bool:
+    """Check if a block should be excluded based on compiled patterns"""
     # Force include patterns take precedence
-    for pattern in include_patterns:
-        if pattern in line:
-            return False
+    if include_re is not None and include_re.search(block):
+        return False
     
     # Then check exclude patterns
-    for pattern in exclude_patterns:
-        if pattern in line:
-            return True
-    
-    return False
+    return exclude_re is not None and exclude_re.search(block) is not None
+
+def classify_block(text_block: str, issue_re: re.Pattern) -> Optional[re.Match]:
+    """Return the match of the highest-priority (lowest-numbered) group of issue_re in the block"""
+    best = None
+    best_group = 0
+    for match in issue_re.finditer(text_block):
+        group = match.lastindex or 0
+        if best is None or group < best_group:
+            best, best_group = match, group
+            if group == 1:
+                break
+    return best
 
-def extract_file_locations(text_block: List[str]) -> Set[str]:
+def line_at(text_block: str, pos: int) -> str:
+    """Return the line of a block of text containing position pos, stripped"""
+    start = text_block.rfind('\n', 0, pos) + 1
+    end = text_block.find('\n', pos)
+    return text_block[start:end if end >= 0 else len(text_block)].strip()
+
+def extract_file_locations(text_block: str) -> Set[str]:
     """Extract file locations from a block of text"""
-    locations = set()
-    
-    # Regular expressions for different file reference formats
-    file_patterns = [
-        re.compile(r'at\s+([^:]+\.[ch][^:]*):(\d+)'),  # at file.c:123
-        re.compile(r'in\s+[^(]+\(([^:]+\.[ch][^:]*):(\d+)\)'),  # in func() (file.c:123)
-        re.compile(r'\(([^:]+\.[ch][^:]*):(\d+)\)'),  # (file.c:123)
-        re.compile(r'([^:\s]+\.[ch][^:]*):(\d+)'),  # file.c:123
-    ]
-    
-    for line in text_block:
-        for pattern in file_patterns:
-            for match in pattern.finditer(line):
-                try:
-                    file_path = match.group(1)
-                    line_num = match.group(2)
-                    locations.add(f"{file_path}:{line_num}")
-                except (IndexError, AttributeError):
-                    pass
-    
-    return locations
+    # The pattern never spans whitespace, so the block is scanned in one go;
+    # the same locations recur across many issues, so they are interned
+    locations: List[str] = []
+    append = locations.append
+    for match in _FILE_LOC_RE.finditer(text_block):
+        append(sys.intern(f"{match.group(1)}:{match.group(2)}"))
+    # Deduplicate once at the end rather than hashing on every match
+    return set(locations)
 
-def extract_stack_trace(text_block: List[str], tool: str) -> List[str]:
+def extract_stack_trace(text_block: str, tool: str) -> List[str]:
     """Extract stack trace from a block of text based on the tool"""
     stack_trace = []
     
@@ -131,33 +192,68 @@ def extract_stack_trace(text_block: List[str], tool: str) -> List[str]:
     if tool == HELGRIND or tool == DRD:
         # Valgrind stack traces typically have "at" or "by" at the beginning of lines
         in_stack = False
-        for line in text_block:
-            if re.match(r'^\s*(?:at|by)\s+', line):
+        for line in text_block.splitlines():
+            match = _VALGRIND_STACK_RE.match(line)
+            if match:
                 in_stack = True
-                # Clean up the line to just show the function and location
-                cleaned = re.sub(r'^\s*(?:at|by)\s+', '', line.strip())
-                stack_trace.append(cleaned)
+                # Keep just the function and location
+                stack_trace.append(sys.intern(match.group(1).rstrip()))
+                if len(stack_trace) >= _MAX_STACK_FRAMES:
+                    break
             elif in_stack and not line.strip():
                 # Empty line likely ends the stack trace
                 break
     
     elif tool == TSAN:
         # TSAN stack traces typically have "#0", "#1", etc.
-        for line in text_block:
-            if re.match(r'^\s*#\d+\s+', line):
-                # Clean up the line to just show the function and location
-                cleaned = re.sub(r'^\s*#\d+\s+', '', line.strip())
-                stack_trace.append(cleaned)
+        for line in text_block.splitlines():
+            match = _TSAN_STACK_RE.match(line)
+            if match:
+                # Keep just the function and location
+                stack_trace.append(sys.intern(match.group(1).rstrip()))
+                if len(stack_trace) >= _MAX_STACK_FRAMES:
+                    break
     
     return stack_trace
 
-def parse_helgrind_log(log_file: str, exclude_patterns: List[str], include_patterns: List[str]) -> List[ThreadIssue]:
+def read_log(log_file: str):
+    """Return the contents of a log file.
+    
+    Logs of at least _MMAP_THRESHOLD bytes are returned as a read-only mmap
+    instead of a full str copy; iter_blocks() decodes them block by block.
+    """
+    if os.path.getsize(log_file) < _MMAP_THRESHOLD:
+        with open(log_file, 'r', errors='replace') as f:
+            return f.read()
+    
+    with open(log_file, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def iter_blocks(content, split_re: re.Pattern, split_re_b: re.Pattern) -> Iterator[str]:
+    """Yield each block of content, starting at a split_re match, as a str.
+    
+    Text before the first match (the log preamble) is skipped. Blocks are
+    sliced out one at a time rather than splitting the whole content up front.
+    """
+    is_mmap = not isinstance(content, str)
+    start = None
+    for match in (split_re_b if is_mmap else split_re).finditer(content):
+        if start is not None:
+            block = content[start:match.start()]
+            yield block.decode('utf-8', 'replace') if is_mmap else block
+        start = match.start()
+    
+    if start is not None:
+        block = content[start:]
+        yield block.decode('utf-8', 'replace') if is_mmap else block
+
+def parse_helgrind_log(log_file: str, exclude_re: Optional[re.Pattern], include_re: Optional[re.Pattern]) -> List[ThreadIssue]:
     """Parse a Helgrind log file and extract issue details"""
     issues = []
+    seen = set()  # Hashes of issues already found in this log
     
     try:
-        with open(log_file, 'r', errors='replace') as f:
-            content = f.read()
+        content = read_log(log_file)
     except Exception as e:
         print(f"Error reading {log_file}: {e}", file=sys.stderr)
         return []
@@ -165,53 +261,30 @@ def parse_helgrind_log(log_file: str, exclude_patterns: List[str], include_patte
     # Extract run ID from filename
     run_id = os.path.basename(log_file).replace('helgrind_', '').replace('.log', '')
     
-    # Split into error blocks
-    error_blocks = re.split(r'==\d+== ?---Thread-Announcement--', content)
-    
     # Process each error block
-    for i, block in enumerate(error_blocks):
-        if i == 0:  # Skip header
-            continue
-        
-        # Reassemble complete block with header
-        if i > 0:
-            block = "==Thread-Announcement--" + block
-        
-        lines = block.strip().split('\n')
-        
+    for block in iter_blocks(content, _HELGRIND_SPLIT, _HELGRIND_SPLIT_B):
         # Skip blocks that match exclude patterns
-        if any(is_excluded(line, exclude_patterns, include_patterns) for line in lines):
+        if is_excluded(block, exclude_re, include_re):
             continue
         
         # Determine issue type
         issue_type = "Unknown"
         description = "Unknown issue"
+        match = classify_block(block, _HELGRIND_ISSUE_RE)
         
-        if "Possible data race" in block:
-            issue_type = "Data Race"
-            # Extract description from first line of error
-            for line in lines:
-                if "Possible data race" in line:
-                    description = line.strip()
-                    break
-        elif "Lock order" in block:
-            issue_type = "Lock Order Violation"
-            # Extract description
-            for line in lines:
-                if "Lock order" in line:
-                    description = line.strip()
-                    break
-        elif "Thread #" in block and ("read" in block or "write" in block):
-            issue_type = "Data Access Violation"
-            # Try to extract a useful description
-            for line in lines[:10]:
-                if "Thread #" in line and ("read" in line or "write" in line):
-                    description = line.strip()
-                    break
+        if match:
+            issue_type = _HELGRIND_ISSUE_TYPES[match.lastindex or 0]
+            # The line that identified the issue doubles as its description
+            description = line_at(block, match.start())
         
-        # Extract file locations and stack trace
-        file_locations = extract_file_locations(lines)
-        stack_trace = extract_stack_trace(lines, HELGRIND)
+        # Skip duplicates before doing any further extraction
+        stack_trace = extract_stack_trace(block, HELGRIND)
+        issue_hash = ThreadIssue.compute_hash(HELGRIND, issue_type, stack_trace)
+        if issue_hash in seen:
+            continue
+        seen.add(issue_hash)
+        
+        file_locations = extract_file_locations(block)
         
         # Create issue object
         issue = ThreadIssue(
@@ -220,21 +293,20 @@ def parse_helgrind_log(log_file: str, exclude_patterns: List[str], include_patte
             description=description,
             stack_trace=stack_trace,
             file_locations=file_locations,
-            run_id=run_id,
-            raw_log=lines
+            run_id=run_id
         )
         
         issues.append(issue)
     
     return issues
 
-def parse_drd_log(log_file: str, exclude_patterns: List[str], include_patterns: List[str]) -> List[ThreadIssue]:
+def parse_drd_log(log_file: str, exclude_re: Optional[re.Pattern], include_re: Optional[re.Pattern]) -> List[ThreadIssue]:
     """Parse a DRD log file and extract issue details"""
     issues = []
+    seen = set()  # Hashes of issues already found in this log
     
     try:
-        with open(log_file, 'r', errors='replace') as f:
-            content = f.read()
+        content = read_log(log_file)
     except Exception as e:
         print(f"Error reading {log_file}: {e}", file=sys.stderr)
         return []
@@ -242,52 +314,30 @@ def parse_drd_log(log_file: str, exclude_patterns: List[str], include_patterns:
     # Extract run ID from filename
     run_id = os.path.basename(log_file).replace('drd_', '').replace('.log', '')
     
-    # Split into error blocks - DRD has different section markers than Helgrind
-    error_blocks = re.split(r'==\d+== ?(?:Conflicting (?:load|store)|[A-Z][a-z]+ lock order violation)', content)
-    prev_header = ""
-    
-    # Process each error block
-    for i, block in enumerate(error_blocks):
-        if i == 0:  # Skip header block
-            continue
-        
-        # Find the header that was split off
-        header_match = re.search(r'==\d+== ?(?:Conflicting (?:load|store)|[A-Z][a-z]+ lock order violation)', 
-                                prev_header)
-        
-        if header_match:
-            # Reassemble complete block with header
-            block = header_match.group(0) + block
-        
-        prev_header = block
-        lines = block.strip().split('\n')
-        
+    # Process each error block - DRD has different section markers than Helgrind
+    for block in iter_blocks(content, _DRD_SPLIT, _DRD_SPLIT_B):
         # Skip blocks that match exclude patterns
-        if any(is_excluded(line, exclude_patterns, include_patterns) for line in lines):
+        if is_excluded(block, exclude_re, include_re):
             continue
         
         # Determine issue type
         issue_type = "Unknown"
         description = "Unknown issue"
+        match = classify_block(block, _DRD_ISSUE_RE)
         
-        if "Conflicting load" in block or "Conflicting store" in block:
-            issue_type = "Data Race"
-            # Extract description
-            for line in lines:
-                if "Conflicting" in line:
-                    description = line.strip()
-                    break
-        elif "lock order violation" in block:
-            issue_type = "Lock Order Violation"
-            # Extract description
-            for line in lines:
-                if "lock order violation" in line:
-                    description = line.strip()
-                    break
+        if match:
+            issue_type = _DRD_ISSUE_TYPES[match.lastindex or 0]
+            # The line that identified the issue doubles as its description
+            description = line_at(block, match.start())
         
-        # Extract file locations and stack trace
-        file_locations = extract_file_locations(lines)
-        stack_trace = extract_stack_trace(lines, DRD)
+        # Skip duplicates before doing any further extraction
+        stack_trace = extract_stack_trace(block, DRD)
+        issue_hash = ThreadIssue.compute_hash(DRD, issue_type, stack_trace)
+        if issue_hash in seen:
+            continue
+        seen.add(issue_hash)
+        
+        file_locations = extract_file_locations(block)
         
         # Create issue object
         issue = ThreadIssue(
@@ -296,21 +346,20 @@ def parse_drd_log(log_file: str, exclude_patterns: List[str], include_patterns:
             description=description,
             stack_trace=stack_trace,
             file_locations=file_locations,
-            run_id=run_id,
-            raw_log=lines
+            run_id=run_id
         )
         
         issues.append(issue)
     
     return issues
 
-def parse_tsan_log(log_file: str, exclude_patterns: List[str], include_patterns: List[str]) -> List[ThreadIssue]:
+def parse_tsan_log(log_file: str, exclude_re: Optional[re.Pattern], include_re: Optional[re.Pattern]) -> List[ThreadIssue]:
     """Parse a ThreadSanitizer log file and extract issue details"""
     issues = []
+    seen = set()  # Hashes of issues already found in this log
     
     try:
-        with open(log_file, 'r', errors='replace') as f:
-            content = f.read()
+        content = read_log(log_file)
     except Exception as e:
         print(f"Error reading {log_file}: {e}", file=sys.stderr)
         return []
@@ -318,56 +367,41 @@ def parse_tsan_log(log_file: str, exclude_patterns: List[str], include_patterns:
     # Extract run ID from filename
     run_id = os.path.basename(log_file).replace('tsan_', '').replace('.log', '')
     
-    # ThreadSanitizer has a different format - split on "WARNING: ThreadSanitizer:"
-    error_blocks = re.split(r'WARNING: ThreadSanitizer:', content)
-    
-    # Process each error block
-    for i, block in enumerate(error_blocks):
-        if i == 0:  # Skip header
-            continue
-        
-        # Reassemble complete block with header
-        block = "WARNING: ThreadSanitizer:" + block
-        
+    # ThreadSanitizer has a different format - blocks start at "WARNING: ThreadSanitizer:"
+    for block in iter_blocks(content, _TSAN_SPLIT, _TSAN_SPLIT_B):
         # Find the end of this error report (usually empty line after stack traces)
         block_end = block.find("\n\n")
         if block_end > 0:
             block = block[:block_end]
         
-        lines = block.strip().split('\n')
-        
         # Skip blocks that match exclude patterns
-        if any(is_excluded(line, exclude_patterns, include_patterns) for line in lines):
+        if is_excluded(block, exclude_re, include_re):
             continue
         
+        # First line is usually the description
+        first_line = block.lstrip().partition('\n')[0].strip()
+        
         # Determine issue type
         issue_type = "Unknown"
-        description = "Unknown issue"
+        description = first_line
+        match = classify_block(block, _TSAN_ISSUE_RE)
         
-        if "data race" in block.lower():
-            issue_type = "Data Race"
-            # First line is usually the description
-            description = lines[0].strip() if lines else "Data Race"
-        elif "lock order inversion" in block.lower() or "deadlock" in block.lower():
-            issue_type = "Lock Order Violation"
-            description = lines[0].strip() if lines else "Lock Order Violation"
-        elif "thread leak" in block.lower():
-            issue_type = "Thread Leak"
-            description = lines[0].strip() if lines else "Thread Leak"
-        elif "use-after-free" in block.lower():
-            issue_type = "Use After Free"
-            description = lines[0].strip() if lines else "Use After Free"
+        if match:
+            issue_type = _TSAN_ISSUE_TYPES[match.lastindex or 0]
         else:
-            # If we can't identify, use first line as type
-            description = lines[0].strip() if lines else "Unknown Issue"
-            # Try to extract a more specific type from first line
-            type_match = re.search(r'(?:WARNING: ThreadSanitizer:)\s*([^:]+)', description)
+            # If we can't identify, try to extract a more specific type from first line
+            type_match = _TSAN_TYPE_RE.search(description)
             if type_match:
                 issue_type = type_match.group(1).strip()
         
-        # Extract file locations and stack trace
-        file_locations = extract_file_locations(lines)
-        stack_trace = extract_stack_trace(lines, TSAN)
+        # Skip duplicates before doing any further extraction
+        stack_trace = extract_stack_trace(block, TSAN)
+        issue_hash = ThreadIssue.compute_hash(TSAN, issue_type, stack_trace)
+        if issue_hash in seen:
+            continue
+        seen.add(issue_hash)
+        
+        file_locations = extract_file_locations(block)
         
         # Create issue object
         issue = ThreadIssue(
@@ -376,8 +410,7 @@ def parse_tsan_log(log_file: str, exclude_patterns: List[str], include_patterns:
             description=description,
             stack_trace=stack_trace,
             file_locations=file_locations,
-            run_id=run_id,
-            raw_log=lines
+            run_id=run_id
         )
         
         issues.append(issue)
@@ -392,36 +425,42 @@ def find_log_files(base_dir: str, tool: str) -> List[str]:
         return []
     
     # Look for files with pattern like 'helgrind_1.log'
-    pattern = os.path.join(tool_dir, f"{tool}_*.log")
-    return glob.glob(pattern)
+    prefix = f"{tool}_"
+    with os.scandir(tool_dir) as entries:
+        return [entry.path for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith('.log') and entry.is_file()]
 
 def parse_all_logs(args: argparse.Namespace) -> Dict[str, List[ThreadIssue]]:
-    """Parse logs from all specified tools"""
+    """Parse logs from all specified tools, one worker process per log file"""
     tools = args.tools.split(',')
-    all_issues = {}
-    
-    for tool in tools:
-        tool = tool.strip().lower()
-        log_files = find_log_files(args.log_dir, tool)
-        
-        print(f"Found {len(log_files)} log files for {tool}")
-        
-        issues = []
-        for log_file in log_files:
-            if tool == HELGRIND:
-                issues.extend(parse_helgrind_log(log_file, args.exclude, args.include))
-            elif tool == DRD:
-                issues.extend(parse_drd_log(log_file, args.exclude, args.include))
-            elif tool == TSAN:
-                issues.extend(parse_tsan_log(log_file, args.exclude, args.include))
-            else:
-                print(f"Warning: Unknown tool {tool}", file=sys.stderr)
+    parsers = {HELGRIND: parse_helgrind_log, DRD: parse_drd_log, TSAN: parse_tsan_log}
+    exclude_re = compile_patterns(args.exclude)
+    include_re = compile_patterns(args.include)
+    futures: Dict[str, List[Future]] = {}
+    
+    with ProcessPoolExecutor() as executor:
+        for tool in tools:
+            tool = tool.strip().lower()
+            log_files = find_log_files(args.log_dir, tool)
+            
+            print(f"Found {len(log_files)} log files for {tool}")
+            
+            parser = parsers.get(tool)
+            if parser is None:
+                if log_files:
+                    print(f"Warning: Unknown tool {tool}", file=sys.stderr)
+                futures[tool] = []
+                continue
+            
+            # Log files are independent, so they are parsed in parallel
+            futures[tool] = [executor.submit(parser, log_file, exclude_re, include_re)
+                             for log_file in log_files]
         
-        all_issues[tool] = issues
-    
-    return all_issues
+        # Each file is deduplicated by its parser; this drops repeats across runs
+        return {tool: deduplicate_issues(chain.from_iterable(future.result() for future in tool_futures))
+                for tool, tool_futures in futures.items()}
 
-def deduplicate_issues(issues: List[ThreadIssue]) -> List[ThreadIssue]:
+def deduplicate_issues(issues: Iterable[ThreadIssue]) -> List[ThreadIssue]:
     """Deduplicate issues based on their hash"""
     unique_issues = {}
     
@@ -431,47 +470,45 @@ def deduplicate_issues(issues: List[ThreadIssue]) -> List[ThreadIssue]:
     
     return list(unique_issues.values())
 
-def generate_report(all_issues: Dict[str, List[ThreadIssue]], args: argparse.Namespace) -> str:
-    """Generate a human-readable report of the issues"""
-    report = []
-    
+def generate_report(all_issues: Dict[str, List[ThreadIssue]], args: argparse.Namespace, out: TextIO) -> None:
+    """Write a human-readable report of the issues to out, line by line"""
     # Overall summary
     total_issues = sum(len(issues) for issues in all_issues.values())
-    report.append(f"Thread Analysis Summary")
-    report.append(f"=====================")
-    report.append(f"Total unique issues found: {total_issues}")
-    report.append("")
+    print(f"Thread Analysis Summary", file=out)
+    print(f"=====================", file=out)
+    print(f"Total unique issues found: {total_issues}", file=out)
+    print("", file=out)
     
     # Summary by tool
     for tool, issues in all_issues.items():
         if not issues:
-            report.append(f"{tool.upper()}: No issues found")
+            print(f"{tool.upper()}: No issues found", file=out)
             continue
         
         # Count issues by type
-        issues_by_type = defaultdict(int)
+        issues_by_type: Dict[str, int] = defaultdict(int)
         for issue in issues:
             issues_by_type[issue.issue_type] += 1
         
-        report.append(f"{tool.upper()}: {len(issues)} issues found")
+        print(f"{tool.upper()}: {len(issues)} issues found", file=out)
         for issue_type, count in issues_by_type.items():
-            report.append(f"  - {issue_type}: {count}")
-        report.append("")
+            print(f"  - {issue_type}: {count}", file=out)
+        print("", file=out)
     
     # If summary only, return here
     if args.summary_only:
-        return "\n".join(report)
+        return
     
     # Detailed report
-    report.append("Detailed Issues")
-    report.append("==============")
+    print("Detailed Issues", file=out)
+    print("==============", file=out)
     
     for tool, issues in all_issues.items():
         if not issues:
             continue
         
-        report.append(f"\n{tool.upper()} Issues:")
-        report.append("=" * (len(tool) + 8))
+        print(f"\n{tool.upper()} Issues:", file=out)
+        print("=" * (len(tool) + 8), file=out)
         
         # Sort issues by type for better organization
         sorted_issues = sorted(issues, key=lambda x: x.issue_type)
@@ -479,28 +516,45 @@ def generate_report(all_issues: Dict[str, List[ThreadIssue]], args: argparse.Nam
         # Show up to max_issues
         for i, issue in enumerate(sorted_issues):
             if i >= args.max_issues:
-                report.append(f"\n... and {len(sorted_issues) - args.max_issues} more {tool.upper()} issues")
+                print(f"\n... and {len(sorted_issues) - args.max_issues} more {tool.upper()} issues", file=out)
                 break
             
-            report.append(f"\nIssue #{i+1}: {issue.issue_type}")
-            report.append("-" * (10 + len(issue.issue_type)))
-            report.append(f"Description: {issue.description}")
+            print(f"\nIssue #{i+1}: {issue.issue_type}", file=out)
+            print("-" * (10 + len(issue.issue_type)), file=out)
+            print(f"Description: {issue.description}", file=out)
             
             # Show file locations
             if issue.file_locations:
-                report.append("File locations:")
+                print("File locations:", file=out)
                 for loc in sorted(issue.file_locations)[:5]:  # Limit to 5 locations
-                    report.append(f"  - {loc}")
+                    print(f"  - {loc}", file=out)
                 if len(issue.file_locations) > 5:
-                    report.append(f"  - ...and {len(issue.file_locations) - 5} more locations")
+                    print(f"  - ...and {len(issue.file_locations) - 5} more locations", file=out)
             
             # Show stack trace
             if issue.stack_trace:
-                report.append("Stack trace (first 3 frames):")
+                print("Stack trace (first 3 frames):", file=out)
                 for frame in issue.stack_trace[:3]:
-                    report.append(f"  - {frame}")
-    
-    return "\n".join(report)
+                    print(f"  - {frame}", file=out)
+
+def write_json(all_issues: Dict[str, List[ThreadIssue]], out: TextIO) -> None:
+    """Write the issues to out as indented JSON, encoding one issue at a time"""
+    encoder = json.JSONEncoder(indent=2)
+    out.write("{")
+    for t, (tool, issues) in enumerate(all_issues.items()):
+        out.write(",\n  " if t else "\n  ")
+        out.write(f"{json.dumps(tool)}: [")
+        for i, issue in enumerate(issues):
+            out.write(",\n    " if i else "\n    ")
+            # JSON strings never hold raw newlines, so this only re-indents the issue
+            if orjson is not None:
+                encoded = orjson.dumps(issue.to_dict(), option=orjson.OPT_INDENT_2).decode()
+                out.write(encoded.replace("\n", "\n    "))
+            else:
+                for chunk in encoder.iterencode(issue.to_dict()):
+                    out.write(chunk.replace("\n", "\n    "))
+        out.write("\n  ]" if issues else "]")
+    out.write("\n}" if all_issues else "}")
 
 def main() -> int:
     """Main entry point"""
@@ -510,36 +564,39 @@ def main() -> int:
     if 'debug.h' not in args.exclude:
         args.exclude.append('debug.h')
     
-    # Parse logs from all tools
+    # Parse logs from all tools (issues come back deduplicated)
     all_issues = parse_all_logs(args)
     
-    # Deduplicate issues for each tool
-    for tool in all_issues:
-        all_issues[tool] = deduplicate_issues(all_issues[tool])
-    
-    # Generate report
-    report = generate_report(all_issues, args)
-    
-    # Output report
+    # Write the report straight to its destination
     if args.output:
         with open(args.output, 'w') as f:
-            f.write(report)
+            generate_report(all_issues, args, f)
         print(f"Report written to {args.output}")
     else:
-        print(report)
+        generate_report(all_issues, args, sys.stdout)
     
     # Output JSON if requested
     if args.json:
-        # Convert issues to dictionaries for JSON serialization
-        json_data = {}
-        for tool, issues in all_issues.items():
-            json_data[tool] = [issue.to_dict() for issue in issues]
-        
         with open(args.json, 'w') as f:
-            json.dump(json_data, f, indent=2)
+            write_json(all_issues, f)
         print(f"JSON data written to {args.json}")
     
     return 0
 
+def compiled_main():
+    """Return main() from a compiled (mypyc) build of this module, if one is present.
+    
+    Build it with "mypyc analyze_thread_logs.py"; without the extension module
+    the script keeps running as plain Python.
+    """
+    name = os.path.splitext(os.path.basename(__file__))[0]
+    spec = importlib.util.find_spec(name)
+    if spec is None or not isinstance(spec.loader, importlib.machinery.ExtensionFileLoader):
+        return None
+    try:
+        return importlib.import_module(name).main
+    except ImportError:
+        return None
+
 if __name__ == '__main__':
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit((compiled_main() or main)()) 
\ No newline at end of file
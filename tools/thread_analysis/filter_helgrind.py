@@ -5,6 +5,19 @@ import re
 import os
 from collections import defaultdict, Counter
 
+# File:line references such as file.h:123, (file.h:123), at file.h:123;
+# compiled once instead of on every block. The lookbehind only lets a match
+# start at the beginning of a path token, so a long run of path characters
+# with no ".h:" is scanned once instead of once per starting position.
+_FILE_LINE_RE = re.compile(r'(?<![\w./\\-])([\w./\\-]+\.h):(\d+)')
+# Source file inside a stack frame, e.g. "(include/api/network/nic.h:231)"
+_FILENAME_RE = re.compile(r'\(([^:)\n]+\.[ch][^:)\n]*)')
+# Dash run of the "==pid== ------" line that ends every Helgrind block; it is
+# tested before the "==" prefix so only real separators get stripped
+_SEPARATOR = '-' * 64
+# Lines that start a Helgrind error report
+_ERROR_MARKERS = ('Possible data race', 'lock order', 'Lock order', 'unlocked a not-locked lock')
+
 def parse_args():
     """Parse command line arguments."""
     import argparse
@@ -40,47 +53,65 @@ def is_excluded(line, exclude_patterns, include_patterns):
     return False
 
 def get_include_files(include_dir):
-    """Return a set of all .h files (with relative paths) in the include_dir and subdirs."""
+    """Return a set of the names of all .h files in the include_dir and subdirs."""
+    # Only basenames are stored: a reference whose path matches a header's
+    # relative path always matches its basename as well
     include_files = set()
-    for root, dirs, files in os.walk(include_dir):
-        for f in files:
-            if f.endswith('.h'):
-                rel_path = os.path.relpath(os.path.join(root, f), include_dir)
-                include_files.add(f)
-                include_files.add(rel_path)
+    pending = [include_dir]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith('.h'):
+                    include_files.add(entry.name)
     return include_files
 
 def extract_file_line_refs(block):
     """Extract (filename, line) pairs from a block of log lines."""
     refs = []
-    # Patterns: file.h:123, (file.h:123), at file.h:123, etc.
-    file_line_re = re.compile(r'([\w\./\\-]+\.h):(\d+)')
+    finditer = _FILE_LINE_RE.finditer
     for line in block:
-        for match in file_line_re.finditer(line):
+        # Every match contains ".h:", so lines without it can skip the regex
+        if '.h:' not in line:
+            continue
+        for match in finditer(line):
             refs.append((os.path.basename(match.group(1)), int(match.group(2)), match.group(1)))
     return refs
 
-def main():
-    args = parse_args()
-    if not os.path.exists(args.logfile):
-        print(f"Error: Log file '{args.logfile}' does not exist.", file=sys.stderr)
-        return 1
-    include_files = get_include_files(args.include_dir)
-    with open(args.logfile, 'r') as f:
-        lines = []
-        for line in f:
-            # Skip DWARF warnings
-            if 'warning: evaluate_Dwarf' in line:
-                continue
-            # Optionally skip thread announcements
-            if args.filter_threads and 'Thread #' in line:
-                continue
-            lines.append(line)
-    output_file = open(args.output, 'w') if args.output else None
-    error_blocks = []
+def count_errors_by_file(block, file_counts):
+    """Add the source files in the 10 lines from each error marker in a block to file_counts."""
+    for i, line in enumerate(block):
+        if not any(marker in line for marker in _ERROR_MARKERS):
+            continue
+        # One regex scan over the joined window instead of one per line
+        file_counts.update(_FILENAME_RE.findall(''.join(block[i:i + 10])))
+
+def iter_blocks(lines, filter_threads=False):
+    """Yield error blocks (lists of lines) from Helgrind log lines, one block at a time.
+    
+    DWARF warnings, and thread announcement lines if filter_threads is set, are
+    dropped; thread announcement blocks are skipped entirely.
+    """
     block = []
     in_thread_announcement = False
     for line in lines:
+        # Stack frames make up most of a log and are never one of the marker
+        # lines tested below, so they skip those checks
+        if ' at 0x' in line or ' by 0x' in line:
+            if not in_thread_announcement:
+                block.append(line)
+            continue
+        # Skip DWARF warnings
+        if 'warning: evaluate_Dwarf' in line:
+            continue
+        # Optionally skip thread announcements
+        if filter_threads and 'Thread #' in line:
+            continue
         # Detect start of thread announcement block
         if '---Thread-Announcement---' in line:
             in_thread_announcement = True
@@ -88,72 +119,103 @@ def main():
             continue
         # Detect end of thread announcement block (next block separator or end)
         if in_thread_announcement:
-            if line.strip().startswith('==') and '----------------------------------------------------------------' in line:
+            if _SEPARATOR in line and line.lstrip().startswith('=='):
                 in_thread_announcement = False
             continue
         block.append(line)
-        if line.strip().startswith('==') and '----------------------------------------------------------------' in line:
-            error_blocks.append(block)
+        if _SEPARATOR in line and line.lstrip().startswith('=='):
+            yield block
             block = []
     if block:
-        error_blocks.append(block)
-    # For each error block, check if it should be excluded, and extract refs
-    file_line_hits = defaultdict(list)  # {filename: [line numbers]}
-    only_files = None
-    if args.only_files:
-        only_files = set(f.strip() for f in args.only_files.split(','))
-    # Deduplication: track unique issue signatures
+        yield block
+
+def _py_parse_blocks(lines, filter_threads, exclude_patterns, include_patterns):
+    """Yield (block, refs) for each error block that is neither excluded nor a duplicate."""
+    # Deduplication: track unique issue signatures (ints)
     seen_signatures = set()
-    for block in error_blocks:
-        block_str = ''.join(block)
-        if any(is_excluded(l, args.exclude, args.include) for l in block):
+    for block in iter_blocks(lines, filter_threads):
+        if any(is_excluded(l, exclude_patterns, include_patterns) for l in block):
             continue
         refs = extract_file_line_refs(block)
-        # Create a signature for this block: sorted tuple of (filename, line) pairs
-        sig = tuple(sorted(set((fname, lineno) for fname, lineno, _ in refs)))
+        # Create a signature for this block: hash of its set of (filename, line) pairs.
+        # Only the int is kept; a collision merely drops a block from a filtered view
+        sig = hash(frozenset((fname, lineno) for fname, lineno, _ in refs))
         if sig in seen_signatures:
             continue  # Skip duplicate
         seen_signatures.add(sig)
-        for fname, lineno, fullpath in refs:
-            if (fname in include_files or fullpath in include_files):
-                if only_files is None or fname in only_files:
-                    file_line_hits[fname].append((lineno, fullpath, block_str))
-    # Print summary (to both stdout and output_file if specified)
+        yield block, refs
+
+# Use the compiled block parser when it has been built
+# (cythonize -i filter_helgrind_core.pyx); it behaves exactly like _py_parse_blocks
+try:
+    from filter_helgrind_core import parse_blocks
+except ImportError:
+    parse_blocks = _py_parse_blocks
+
+def main():
+    args = parse_args()
+    if not os.path.exists(args.logfile):
+        print(f"Error: Log file '{args.logfile}' does not exist.", file=sys.stderr)
+        return 1
+    include_files = get_include_files(args.include_dir)
+    # For each error block, check if it should be excluded, and extract refs
+    file_issue_count = Counter()  # {filename: number of issues}
+    first_fullpath = defaultdict(dict)  # {filename: {line number: first full path seen}}
+    file_blocks = defaultdict(list)  # {filename: [(line number, full path, block lines)]}, only when printing blocks
+    only_files = None
+    if args.only_files:
+        only_files = set(f.strip() for f in args.only_files.split(','))
+    file_error_count = Counter()  # {source file: errors referencing it}, with --count-by-file
+    # Decoded as text in large chunks by the io layer: matching bytes lines is
+    # slower in CPython than matching str, so per-line lazy decoding does not pay.
+    # Stray non-UTF-8 bytes (e.g. from program output) must not abort the run
+    with open(args.logfile, 'r', encoding='utf-8', errors='replace') as f:
+        for block, refs in parse_blocks(f, args.filter_threads, args.exclude, args.include):
+            if args.count_by_file:
+                count_errors_by_file(block, file_error_count)
+            for fname, lineno, fullpath in refs:
+                if fname in include_files:
+                    if only_files is None or fname in only_files:
+                        file_issue_count[fname] += 1
+                        first_fullpath[fname].setdefault(lineno, fullpath)
+                        if not args.summary:
+                            # Keep the line list; it is only joined if it gets printed
+                            file_blocks[fname].append((lineno, fullpath, block))
+    # Print summary (to both stdout and the output file if specified)
     summary_lines = []
     summary_lines.append(f"Found issues in the following include files:")
-    for fname in sorted(file_line_hits):
-        unique_lines = sorted(set(lineno for lineno, _, _ in file_line_hits[fname]))
-        summary_lines.append(f"  {fname}: {len(file_line_hits[fname])} issues")
-        for lineno in unique_lines:
-            # Find a fullpath for this line (first occurrence)
-            fullpath = next((fp for l, fp, _ in file_line_hits[fname] if l == lineno), fname)
+    for fname in sorted(file_issue_count):
+        summary_lines.append(f"  {fname}: {file_issue_count[fname]} issues")
+        for lineno, fullpath in sorted(first_fullpath[fname].items()):
             summary_lines.append(f"    - {fullpath}:{lineno}")
+    if args.count_by_file:
+        summary_lines.append("Error counts by file:")
+        for fname, n in file_error_count.most_common():
+            summary_lines.append(f"  {fname}: {n}")
     summary_lines.append("="*80)
-    for line in summary_lines:
-        print(line)
-        if output_file:
-            output_file.write(line + "\n")
+    # Output is collected and written with one call per destination; stdout
+    # also gets a blank line after each block
+    out_buf = [line + "\n" for line in summary_lines]
+    stdout_buf = list(out_buf)
     # Optionally print error blocks
     if not args.summary:
         count = 0
-        for fname in sorted(file_line_hits):
-            for lineno, fullpath, block_str in file_line_hits[fname]:
+        for fname in sorted(file_blocks):
+            for lineno, fullpath, block in file_blocks[fname]:
                 count += 1
                 if count > args.max_errors:
-                    msg = f"... and more (use --max-errors to see more)"
-                    print(msg)
-                    if output_file:
-                        output_file.write(msg + "\n")
+                    msg = f"... and more (use --max-errors to see more)\n"
+                    out_buf.append(msg)
+                    stdout_buf.append(msg)
                     break
-                header = f"\n=== Issue in {fullpath}:{lineno} ==="
-                print(header)
-                if output_file:
-                    output_file.write(header + "\n")
-                print(block_str)
-                if output_file:
-                    output_file.write(block_str)
-    if output_file:
-        output_file.close()
+                header = f"\n=== Issue in {fullpath}:{lineno} ===\n"
+                block_str = ''.join(block)
+                out_buf += (header, block_str)
+                stdout_buf += (header, block_str, "\n")
+    sys.stdout.write(''.join(stdout_buf))
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(''.join(out_buf))
     return 0
 
 if __name__ == '__main__':
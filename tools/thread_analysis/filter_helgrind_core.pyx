@@ -0,0 +1,98 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled block parser for filter_helgrind.py.
+
+Build in place with:  cythonize -i filter_helgrind_core.pyx
+filter_helgrind.py imports parse_blocks() from here when the extension is
+built and falls back to its pure-Python _py_parse_blocks() otherwise; the
+two must stay in step.
+"""
+
+import os
+import re
+
+# Same pattern as filter_helgrind._FILE_LINE_RE
+_FILE_LINE_RE = re.compile(r'(?<![\w./\\-])([\w./\\-]+\.h):(\d+)')
+
+cdef str _SEPARATOR = '----------------------------------------------------------------'
+
+
+cdef inline bint _is_separator(str line):
+    return _SEPARATOR in line and line.lstrip().startswith('==')
+
+
+cdef bint _is_excluded(list block, list exclude_patterns, list include_patterns):
+    """True if any line of the block is excluded (include patterns win per line)."""
+    cdef str line, pattern
+    cdef bint excluded
+    for line in block:
+        excluded = False
+        for pattern in include_patterns:
+            if pattern in line:
+                break
+        else:
+            for pattern in exclude_patterns:
+                if pattern in line:
+                    excluded = True
+                    break
+        if excluded:
+            return True
+    return False
+
+
+cdef list _extract_file_line_refs(list block):
+    cdef list refs = []
+    cdef str line
+    finditer = _FILE_LINE_RE.finditer
+    for line in block:
+        if '.h:' not in line:
+            continue
+        for match in finditer(line):
+            refs.append((os.path.basename(match.group(1)), int(match.group(2)), match.group(1)))
+    return refs
+
+
+def parse_blocks(lines, bint filter_threads, list exclude_patterns, list include_patterns):
+    """Yield (block, refs) for each error block that is neither excluded nor a duplicate."""
+    cdef set seen_signatures = set()
+    cdef list block = []
+    cdef list refs
+    cdef bint in_thread_announcement = False
+    cdef str line
+    cdef Py_hash_t sig
+
+    for line in lines:
+        # Stack frames are never one of the marker lines below
+        if ' at 0x' in line or ' by 0x' in line:
+            if not in_thread_announcement:
+                block.append(line)
+            continue
+        if 'warning: evaluate_Dwarf' in line:
+            continue
+        if filter_threads and 'Thread #' in line:
+            continue
+        if '---Thread-Announcement---' in line:
+            in_thread_announcement = True
+            block = []
+            continue
+        if in_thread_announcement:
+            if _is_separator(line):
+                in_thread_announcement = False
+            continue
+        block.append(line)
+        if not _is_separator(line):
+            continue
+
+        # A complete block: filter, extract refs and deduplicate
+        if not _is_excluded(block, exclude_patterns, include_patterns):
+            refs = _extract_file_line_refs(block)
+            sig = hash(frozenset([(ref[0], ref[1]) for ref in refs]))
+            if sig not in seen_signatures:
+                seen_signatures.add(sig)
+                yield block, refs
+        block = []
+
+    if block and not _is_excluded(block, exclude_patterns, include_patterns):
+        refs = _extract_file_line_refs(block)
+        sig = hash(frozenset([(ref[0], ref[1]) for ref in refs]))
+        if sig not in seen_signatures:
+            yield block, refs
@@ -1,22 +1,46 @@
+import mmap
+import os
 import sys
 
+# Dash run of the "==pid== ------" line that ends every Helgrind block
+SEPARATOR = b"-" * 64
+
+def _py_kept_blocks(log, exclude):
+    """Yield the (start, end) byte range of every block of log that does not contain exclude."""
+    # Only separator lines are looked at; the exclude pattern is searched once
+    # over each block's byte range
+    block_start = 0
+    dashes = log.find(SEPARATOR)
+    while dashes != -1:
+        line_start = log.rfind(b"\n", 0, dashes) + 1
+        line_end = log.find(b"\n", dashes) + 1 or len(log)
+        if log[line_start:line_end].lstrip().startswith(b"=="):
+            # End of block
+            if log.find(exclude, block_start, line_end) == -1:
+                yield block_start, line_end
+            block_start = line_end
+        dashes = log.find(SEPARATOR, line_end)
+    # Any remaining block, if not skipped
+    if block_start < len(log) and log.find(exclude, block_start) == -1:
+        yield block_start, len(log)
+
+# Use the compiled block scanner when it has been built
+# (cythonize -i filter_helgrind_log_core.pyx); it behaves exactly like _py_kept_blocks
+try:
+    from filter_helgrind_log_core import kept_blocks
+except ImportError:
+    kept_blocks = _py_kept_blocks
+
 def filter_helgrind_log(input_path, output_path, exclude_pattern="debug.h"):
-    with open(input_path, "r") as infile, open(output_path, "w") as outfile:
-        block = []
-        skip_block = False
-        for line in infile:
-            block.append(line)
-            if exclude_pattern in line:
-                skip_block = True
-            if line.strip().startswith("==") and "----------------------------------------------------------------" in line:
-                # End of block
-                if not skip_block:
-                    outfile.writelines(block)
-                block = []
-                skip_block = False
-        # Write any remaining block if not skipped
-        if block and not skip_block:
-            outfile.writelines(block)
+    # The log is scanned as bytes through a read-only mmap, and each kept
+    # block is written as one slice
+    exclude = exclude_pattern.encode()
+    with open(input_path, "rb") as infile, open(output_path, "wb") as outfile:
+        if os.fstat(infile.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as log:
+            for start, end in kept_blocks(log, exclude):
+                outfile.write(log[start:end])
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
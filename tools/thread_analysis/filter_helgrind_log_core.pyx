@@ -0,0 +1,72 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled block scanner for filter_helgrind_log.py.
+
+Build in place with:  cythonize -i filter_helgrind_log_core.pyx
+filter_helgrind_log.py imports kept_blocks() from here when the extension is
+built and falls back to its pure-Python _py_kept_blocks() otherwise; the two
+must stay in step.
+"""
+
+from libc.string cimport memchr, memcmp
+
+# Same separator as filter_helgrind_log.SEPARATOR
+cdef bytes _SEPARATOR = b"-" * 64
+
+
+cdef Py_ssize_t _find(const unsigned char* buf, Py_ssize_t start, Py_ssize_t end,
+                      const unsigned char* pattern, Py_ssize_t pattern_len) nogil:
+    """Offset of the first pattern in buf[start:end], or -1 (like bytes.find)."""
+    cdef const unsigned char* hit
+    if pattern_len == 0:
+        return start if start <= end else -1
+    while end - start >= pattern_len:
+        hit = <const unsigned char*>memchr(buf + start, pattern[0], end - start - pattern_len + 1)
+        if hit == NULL:
+            return -1
+        start = hit - buf
+        if memcmp(hit, pattern, pattern_len) == 0:
+            return start
+        start += 1
+    return -1
+
+
+cdef bint _starts_with_marker(const unsigned char* buf, Py_ssize_t start, Py_ssize_t end) nogil:
+    """True if buf[start:end].lstrip() starts with b"=="."""
+    cdef unsigned char c
+    while start < end:
+        c = buf[start]
+        if c != 32 and not 9 <= c <= 13:  # ASCII whitespace, as bytes.lstrip()
+            break
+        start += 1
+    return end - start >= 2 and buf[start] == 61 and buf[start + 1] == 61
+
+
+def kept_blocks(const unsigned char[::1] log, bytes exclude):
+    """Return the (start, end) byte range of every block of log that does not contain exclude."""
+    cdef const unsigned char* buf = &log[0] if log.shape[0] else NULL
+    cdef Py_ssize_t n = log.shape[0]
+    cdef const unsigned char* separator = _SEPARATOR
+    cdef Py_ssize_t separator_len = len(_SEPARATOR)
+    cdef const unsigned char* pattern = exclude
+    cdef Py_ssize_t pattern_len = len(exclude)
+    cdef Py_ssize_t block_start = 0, line_start, line_end, dashes
+    cdef const unsigned char* newline
+    cdef list kept = []
+
+    dashes = _find(buf, 0, n, separator, separator_len)
+    while dashes != -1:
+        line_start = dashes
+        while line_start > 0 and buf[line_start - 1] != 10:
+            line_start -= 1
+        newline = <const unsigned char*>memchr(buf + dashes, 10, n - dashes)
+        line_end = newline - buf + 1 if newline != NULL else n
+        if _starts_with_marker(buf, line_start, line_end):
+            # End of block
+            if _find(buf, block_start, line_end, pattern, pattern_len) == -1:
+                kept.append((block_start, line_end))
+            block_start = line_end
+        dashes = _find(buf, line_end, n, separator, separator_len)
+    # Any remaining block, if not skipped
+    if block_start < n and _find(buf, block_start, n, pattern, pattern_len) == -1:
+        kept.append((block_start, n))
+    return kept